@@ -0,0 +1,138 @@
+"""Generate deal notes and metrics for every ingested startup.
+
+Reads the <startup>.json files written by batch_ingest.py, runs deal notes
+and metric extraction for each one, writes <output-dir>/<startup>.deal_notes.docx
+and adds the metrics to the portfolio metrics store. Model calls go through
+an LLMScheduler at batch priority, so LLM_MAX_CONCURRENCY, LLM_RPM and
+LLM_TPM hold across all startups, and when the dashboard runs this the
+interactive requests of its users are served first.
+
+    python batch_generate.py data/output --jobs 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List
+
+import tracing
+
+DEAL_NOTES_PROMPT_PATH = os.path.join("config", "prompt", "deal_notes_generation.md")
+METRIC_PROMPT_PATH = os.path.join("config", "prompt", "metric_generation.md")
+
+
+def list_ingested(output_dir: str) -> List[str]:
+    return sorted(
+        os.path.join(output_dir, name) for name in os.listdir(output_dir)
+        if name.endswith(".json") and os.path.isfile(os.path.join(output_dir, name))
+    )
+
+
+# Fold a batch_ingest output (several decks and checklists) into the single
+# pdf_text / pdf_graphs / web_data shape the generation prompts are built from
+def startup_information(ingested: Dict[str, Any]) -> Dict[str, Any]:
+    texts, graphs, web_data = [], [], []
+    for document in ingested.get("documents", []):
+        data = document["data"]
+        if document["type"] == "pdf":
+            texts.append(data.get("pdf_text", ""))
+            graphs.extend(data.get("pdf_graphs", []))
+            web_data.extend(data.get("web_data", []))
+        else:
+            texts.append(data.get("docx_text", ""))
+    return {"startup": ingested.get("startup"), "pdf_text": "\n".join(texts), "pdf_graphs": graphs,
+            "web_data": web_data}
+
+
+def generate_startup(path: str, prompts: Dict[str, str], client, output_dir: str,
+                     llm_options: Dict[str, Any]) -> Dict[str, Any]:
+    from deal_notes_generation import read_data, save_to_docx
+    from pipeline import run_generation_pipeline
+
+    ingested = read_data(path)
+    startup = ingested.get("startup") or os.path.splitext(os.path.basename(path))[0]
+    start = time.perf_counter()
+    run = run_generation_pipeline(prompts["deal_notes"], prompts["metrics"], startup_information(ingested),
+                                  client, **llm_options).wait()
+    deal_notes, metrics = run.deal_notes.result(), run.metrics.result()
+    docx_path = os.path.join(output_dir, f"{startup}.deal_notes.docx")
+    if deal_notes is not None:
+        save_to_docx(deal_notes, docx_path)
+    return {"startup": startup, "deal_notes": None if deal_notes is None else docx_path, "metrics": metrics,
+            "seconds": time.perf_counter() - start}
+
+
+# Run every ingested startup, up to `jobs` at a time, on `client` (a
+# ScheduledClient at BATCH priority). record_metrics(startup, metrics) is
+# called from this thread as each startup finishes; on_done(summary) too.
+def generate_portfolio(paths: List[str], prompts: Dict[str, str], client, output_dir: str,
+                       record_metrics: Callable[[str, Any], None], jobs: int = 2,
+                       on_done: Callable[[Dict[str, Any]], None] = None,
+                       **llm_options) -> List[Dict[str, Any]]:
+    summaries = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="portfolio") as executor:
+        futures = {tracing.submit(executor, generate_startup, path, prompts, client, output_dir, llm_options): path
+                   for path in paths}
+        for future in as_completed(futures):
+            try:
+                summary = future.result()
+                if summary["metrics"]:
+                    record_metrics(summary["startup"], summary["metrics"])
+            except Exception as e:
+                summary = {"startup": os.path.splitext(os.path.basename(futures[future]))[0], "error": str(e)}
+            summaries.append(summary)
+            if on_done is not None:
+                on_done(summary)
+    return summaries
+
+
+def load_prompts() -> Dict[str, str]:
+    prompts = {}
+    for name, path in (("deal_notes", DEAL_NOTES_PROMPT_PATH), ("metrics", METRIC_PROMPT_PATH)):
+        with open(path, "r", encoding="utf-8") as f:
+            prompts[name] = f.read()
+    return prompts
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate deal notes and metrics for every ingested startup.")
+    parser.add_argument("output_dir", nargs="?", default=os.path.join("data", "output"))
+    parser.add_argument("--jobs", type=int, default=2, help="startups generated in parallel")
+    parser.add_argument("--refresh", action="store_true", help="bypass the response cache")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from google import genai
+    from llm_cache import LLMCache
+    from llm_scheduler import BATCH, LLMScheduler
+    from metrics_store import DEFAULT_METRICS_STORE_PATH, MetricsStore
+
+    load_dotenv()
+    scheduler = LLMScheduler.from_env()
+    client = scheduler.client(genai.Client(), priority=BATCH)
+    store = MetricsStore(DEFAULT_METRICS_STORE_PATH)
+
+    def record_metrics(startup, metrics):
+        store.upsert(startup, metrics)
+        store.save()
+
+    def report(summary):
+        if "error" in summary:
+            print(f"[failed]  {summary['startup']}: {summary['error']}", file=sys.stderr)
+        else:
+            print(f"[done]    {summary['startup']}: {summary['seconds']:.1f}s")
+
+    start = time.perf_counter()
+    summaries = generate_portfolio(list_ingested(args.output_dir), load_prompts(), client, args.output_dir,
+                                   record_metrics, jobs=args.jobs, on_done=report,
+                                   cache=LLMCache(), refresh=args.refresh)
+    failures = sum("error" in summary for summary in summaries)
+    print(f"\n{len(summaries) - failures} generated, {failures} failed in {time.perf_counter() - start:.1f}s")
+    print(json.dumps(scheduler.stats()))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
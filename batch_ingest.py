@@ -0,0 +1,160 @@
+"""Ingest every startup folder under an input directory.
+
+Each data/input/<startup>/ folder is processed as one unit: all PDF decks go
+through extract_all_content_from_pdf and the founders-checklist .docx files
+through extract_docx_content. Results are written to
+<output-dir>/<startup>.json. Startups run in parallel, up to --jobs at a time.
+A startup is skipped when its output already matches the current source files
+(size and mtime), so an interrupted run picks up where it stopped.
+
+    python batch_ingest.py data/input --output-dir data/output --jobs 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+SKIP_DIRS = ("__MACOSX",)
+
+
+def list_startups(input_dir: str) -> List[str]:
+    return sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if os.path.isdir(os.path.join(input_dir, name)) and name not in SKIP_DIRS and not name.startswith(".")
+    )
+
+
+def list_documents(startup_dir: str) -> List[str]:
+    docs = []
+    for root, dirs, files in os.walk(startup_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            # "._x" are macOS resource forks, "~$x" are Word lock files
+            if name.startswith(("._", "~$")):
+                continue
+            if name.lower().endswith((".pdf", ".docx")):
+                docs.append(os.path.join(root, name))
+    return docs
+
+
+def source_manifest(paths: List[str], startup_dir: str) -> Dict[str, Dict[str, float]]:
+    manifest = {}
+    for path in paths:
+        st = os.stat(path)
+        manifest[os.path.relpath(path, startup_dir)] = {"size": st.st_size, "mtime": st.st_mtime}
+    return manifest
+
+
+def output_is_current(output_path: str, manifest: Dict[str, Any]) -> bool:
+    try:
+        with open(output_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("sources") == manifest
+    except (OSError, ValueError):
+        return False
+
+
+def ingest_startup(startup_dir: str, output_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    from test_input_agent import extract_all_content_from_pdf, extract_docx_content, save_all_data
+    from ocr_cache import OCRCache
+    from web_cache import WebCache
+    from web_fetcher import WebFetcher
+
+    startup = os.path.basename(os.path.normpath(startup_dir))
+    output_path = os.path.join(output_dir, f"{startup}.json")
+    docs = list_documents(startup_dir)
+    manifest = source_manifest(docs, startup_dir)
+    summary = {"startup": startup, "output": output_path, "docs": 0, "pages": 0, "ocr_seconds": 0.0, "skipped": False}
+    if not options["force"] and output_is_current(output_path, manifest):
+        summary["skipped"] = True
+        return summary
+
+    state_dir = os.path.join(output_dir, startup)
+    os.makedirs(state_dir, exist_ok=True)
+    fetcher = WebFetcher(cache=WebCache(options["web_cache_dir"], offline=options["offline"]))
+    ocr_cache = OCRCache(options["ocr_cache_dir"])
+    documents = []
+    start = time.perf_counter()
+    for path in docs:
+        rel_path = os.path.relpath(path, startup_dir)
+        if path.lower().endswith(".pdf"):
+            # State mirrors the startup folder, so decks with the same name in
+            # different subfolders don't overwrite each other's page records
+            state_path = os.path.join(state_dir, os.path.splitext(rel_path)[0] + ".pages.json")
+            os.makedirs(os.path.dirname(state_path), exist_ok=True)
+            data = extract_all_content_from_pdf(
+                path, fetcher=fetcher, state_path=state_path,
+                backend=options["backend"], ocr_cache=ocr_cache,
+            )
+            # Only pages actually extracted count towards throughput
+            summary["pages"] += len(data["page_diff"]["reprocessed"])
+            summary["ocr_seconds"] += data["ocr_stats"]["load_seconds"] + data["ocr_stats"]["inference_seconds"]
+            documents.append({"path": rel_path, "type": "pdf", "data": data})
+        else:
+            documents.append({"path": rel_path, "type": "docx", "data": extract_docx_content(path)})
+        summary["docs"] += 1
+    summary["seconds"] = time.perf_counter() - start
+
+    # Write to a temp file first so a crash never leaves a half-written output
+    tmp_path = output_path + ".tmp"
+    save_all_data({"startup": startup, "sources": manifest, "documents": documents}, tmp_path)
+    os.replace(tmp_path, output_path)
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest every startup folder under an input directory.")
+    parser.add_argument("input_dir", nargs="?", default=os.path.join("data", "input"))
+    parser.add_argument("--output-dir", default=os.path.join("data", "output"))
+    parser.add_argument("--jobs", type=int, default=2, help="startups processed in parallel")
+    parser.add_argument("--backend", default="pypdf2", choices=("pypdf2", "pymupdf"))
+    parser.add_argument("--ocr-cache-dir", default=os.path.join(".cache", "ocr"))
+    parser.add_argument("--web-cache-dir", default=os.path.join(".cache", "web"))
+    parser.add_argument("--offline", action="store_true", help="serve web links from the cache only")
+    parser.add_argument("--force", action="store_true", help="re-ingest startups whose output is current")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    options = {
+        "backend": args.backend,
+        "ocr_cache_dir": args.ocr_cache_dir,
+        "web_cache_dir": args.web_cache_dir,
+        "offline": args.offline,
+        "force": args.force,
+    }
+    startups = list_startups(args.input_dir)
+    summaries = []
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {executor.submit(ingest_startup, path, args.output_dir, options): path for path in startups}
+        for future in as_completed(futures):
+            name = os.path.basename(futures[future])
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"[failed]  {name}: {e}", file=sys.stderr)
+                continue
+            summaries.append(summary)
+            if summary["skipped"]:
+                print(f"[skipped] {name}: output is current")
+            else:
+                print(f"[done]    {name}: {summary['docs']} docs, {summary['pages']} pages "
+                      f"in {summary['seconds']:.1f}s")
+    elapsed = time.perf_counter() - start
+
+    done = [s for s in summaries if not s["skipped"]]
+    docs = sum(s["docs"] for s in done)
+    pages = sum(s["pages"] for s in done)
+    ocr_seconds = sum(s["ocr_seconds"] for s in done)
+    minutes = elapsed / 60 if elapsed else 1
+    print(f"\n{len(done)} ingested, {len(summaries) - len(done)} skipped, {failures} failed in {elapsed:.1f}s")
+    print(f"{docs / minutes:.1f} docs/min, {pages / minutes:.1f} pages/min, {ocr_seconds:.1f} OCR seconds")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
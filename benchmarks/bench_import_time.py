@@ -0,0 +1,90 @@
+"""Cold-start import time of the dashboard and the ingestion entry points.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the best cumulative time per module, plus the heaviest imports it
+pulled in. With --baseline, exits non-zero if a module got slower than the
+stored numbers by more than --tolerance.
+
+    python benchmarks/bench_import_time.py --repeat 5 --json import_times.json
+    python benchmarks/bench_import_time.py --baseline import_times.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+from common import REPO_ROOT
+
+MODULES = ("streamlit_app", "test_input_agent", "batch_ingest")
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in out.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            _, cumulative_us, indent, name = match.groups()
+            entries.append((len(indent), name, int(cumulative_us)))
+    # importtime prints children before their parent, so the module's direct
+    # imports are the lines just above it that are one level deeper
+    for i in range(len(entries) - 1, -1, -1):
+        depth, name, cumulative_us = entries[i]
+        if name == module:
+            break
+    else:
+        return 0.0, {}
+    children = {}
+    for child_depth, child_name, child_us in reversed(entries[:i]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 2:
+            children[child_name] = child_us
+    return cumulative_us / 1e6, children
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per module")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio vs. baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        best_seconds, breakdown = min(runs, key=lambda run: run[0])
+        heaviest = sorted(((us / 1e6, name) for name, us in breakdown.items()), reverse=True)
+        results[module] = {
+            "seconds": round(best_seconds, 4),
+            "heaviest": [{"module": name, "seconds": round(sec, 4)} for sec, name in heaviest[:args.top]],
+        }
+        print(f"{module:20} {best_seconds * 1000:8.1f} ms   "
+              + ", ".join(f"{name} {sec * 1000:.0f}ms" for sec, name in heaviest[:args.top]))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = [
+            module for module, result in results.items()
+            if module in baseline and result["seconds"] > baseline[module]["seconds"] * (1 + args.tolerance)
+        ]
+        for module in regressions:
+            print(f"REGRESSION {module}: {baseline[module]['seconds']:.3f}s -> {results[module]['seconds']:.3f}s")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Peak RSS of whole-document extraction vs. streaming page-by-page to JSON Lines.
+
+Each mode runs in a fresh interpreter. OCR is off unless --ocr is given, so
+the comparison isolates image buffering rather than model memory.
+
+    python benchmarks/bench_memory.py deck.pdf [--ocr] [--json out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import input_decks, peak_rss_mb
+
+MODES = ("in_memory", "streaming")
+
+
+def run_worker(pdf_path, mode, ocr):
+    from test_input_agent import extract_pdf_content, stream_pdf_to_jsonl
+    start = time.perf_counter()
+    if mode == "in_memory":
+        # Every image buffer held until the end, as the whole-document path used to
+        data = extract_pdf_content(pdf_path, ocr=ocr, keep_image_bytes=True)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump({**data, "images": [{k: v for k, v in img.items() if k != "image_bytes"}
+                                          for img in data["images"]]}, f)
+    else:
+        with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as f:
+            out_path = f.name
+        stream_pdf_to_jsonl(pdf_path, out_path, ocr=ocr)
+    os.remove(f.name)
+    print(json.dumps({
+        "pdf": pdf_path,
+        "mode": mode,
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="PDF files (default: data/input/**/*.pdf)")
+    parser.add_argument("--ocr", action="store_true")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("PDF", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker[0], args.worker[1], args.ocr)
+        return
+
+    pdfs = args.pdfs or input_decks()
+    if not pdfs:
+        print("No PDF decks found; pass paths explicitly.")
+        return
+    results = []
+    for pdf_path in pdfs:
+        for mode in MODES:
+            cmd = [sys.executable, __file__, "--worker", pdf_path, mode] + (["--ocr"] if args.ocr else [])
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'deck':40} {'mode':10} {'seconds':>8} {'peak MB':>8}")
+    for r in results:
+        print(f"{os.path.basename(r['pdf'])[:40]:40} {r['mode']:10} {r['seconds']:8.3f} {r['peak_rss_mb']:8.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
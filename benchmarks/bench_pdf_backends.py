@@ -0,0 +1,75 @@
+"""Compare parse time and peak RSS of the PDF extraction backends.
+
+Each (deck, backend) pair runs in a fresh interpreter so peak RSS is not
+polluted by earlier runs. OCR is disabled: this measures parsing only.
+
+    python benchmarks/bench_pdf_backends.py                # decks in data/input/
+    python benchmarks/bench_pdf_backends.py deck.pdf --repeat 5 --json out.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import input_decks, peak_rss_mb
+
+
+def run_worker(pdf_path, backend, repeat):
+    from test_input_agent import extract_pdf_content
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = extract_pdf_content(pdf_path, backend=backend, ocr=False)
+        timings.append(time.perf_counter() - start)
+    print(json.dumps({
+        "pdf": pdf_path,
+        "backend": backend,
+        "pages_text_chars": len(data["text"]),
+        "links": len(data["links"]),
+        "images": len(data["images"]),
+        "best_seconds": round(min(timings), 4),
+        "mean_seconds": round(sum(timings) / len(timings), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="PDF files (default: data/input/**/*.pdf)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("PDF", "BACKEND"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker[0], args.worker[1], args.repeat)
+        return
+
+    from test_input_agent import PDF_BACKENDS
+    pdfs = args.pdfs or input_decks()
+    if not pdfs:
+        print("No PDF decks found; pass paths explicitly.")
+        return
+
+    results = []
+    for pdf_path in pdfs:
+        for backend in PDF_BACKENDS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", pdf_path, backend, "--repeat", str(args.repeat)],
+                capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'deck':40} {'backend':8} {'best s':>8} {'mean s':>8} {'peak MB':>8} {'links':>6} {'images':>6}")
+    for r in results:
+        print(f"{os.path.basename(r['pdf'])[:40]:40} {r['backend']:8} {r['best_seconds']:8.3f} "
+              f"{r['mean_seconds']:8.3f} {r['peak_rss_mb']:8.1f} {r['links']:6d} {r['images']:6d}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
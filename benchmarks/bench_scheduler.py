@@ -0,0 +1,65 @@
+"""LLM scheduler under a mixed interactive/batch load with injected 429s.
+
+A batch of background generations (e.g. a portfolio re-run) is queued on a
+fake client that throttles a share of calls; a few interactive requests
+arrive while it drains. Reports completion time, retries and queue wait per
+priority, i.e. how long a dashboard user waits behind the batch.
+
+    python benchmarks/bench_scheduler.py --batch 40 --interactive 5 --error-rate 0.2 [--rpm 600]
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import REPO_ROOT  # noqa: F401  (puts the repo on sys.path)
+from fixtures import FakeGenAIClient
+from llm_cache import generate_text
+from llm_scheduler import BATCH, INTERACTIVE, LLMScheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=40)
+    parser.add_argument("--interactive", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rpm", type=float, help="requests per minute limit")
+    parser.add_argument("--tpm", type=float, help="tokens per minute limit")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="share of calls answered with a 429")
+    parser.add_argument("--llm-latency", type=float, default=0.1)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    fake = FakeGenAIClient(latency=args.llm_latency, error_rate=args.error_rate)
+    scheduler = LLMScheduler(max_concurrency=args.concurrency, requests_per_minute=args.rpm,
+                             tokens_per_minute=args.tpm, retries=8, backoff=0.05, max_backoff=1.0)
+    batch_client = scheduler.client(fake, BATCH)
+    interactive_client = scheduler.client(fake, INTERACTIVE)
+
+    start = time.perf_counter()
+    # One thread per request, so everything is queued in the scheduler at once
+    with ThreadPoolExecutor(max_workers=args.batch + args.interactive) as executor:
+        batch = [executor.submit(generate_text, batch_client, "Deal notes", f"startup {i}")
+                 for i in range(args.batch)]
+        time.sleep(args.llm_latency)
+        interactive = [executor.submit(generate_text, interactive_client, "Deal notes", f"dashboard {i}")
+                       for i in range(args.interactive)]
+        for future in batch + interactive:
+            future.result()
+    stats = scheduler.stats()
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["calls"] = fake.calls
+    stats["injected_429s"] = fake.errors
+
+    print(f"{args.batch} batch + {args.interactive} interactive requests in {stats['seconds']:.2f}s, "
+          f"{fake.calls} calls, {stats['throttled']} throttled, {stats['retries']} retries, "
+          f"max queue depth {stats['max_queue_depth']}")
+    for priority, waits in stats["wait_seconds"].items():
+        print(f"  {priority:12} wait p50 {waits['p50']:.3f}s  p95 {waits['p95']:.3f}s  max {waits['max']:.3f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""End-to-end benchmark of ingestion and generation on synthetic inputs.
+
+Generates PDF decks of several page/image counts, serves the pages they link
+to from a local HTTP server and replaces Gemini with a fake client of fixed
+latency, so runs are reproducible offline. Each scenario runs in a fresh
+interpreter and reports throughput, p50/p95 latency and peak RSS for
+extract_all_content_from_pdf, generate_deal_notes and metric_extraction_agent.
+
+    python benchmarks/bench_suite.py --json bench_results.json
+    python benchmarks/bench_suite.py --baseline bench_results.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import REPO_ROOT, peak_rss_mb, percentile
+from fixtures import FakeGenAIClient, LinkServer, make_pdf
+
+# name -> (pages, images per page)
+DECKS = {"small": (5, 1), "medium": (20, 3), "large": (60, 4)}
+COMPARED = ("p50_seconds", "p95_seconds", "peak_rss_mb")
+
+
+def run_ingest(spec):
+    from test_input_agent import extract_all_content_from_pdf
+    from web_fetcher import WebFetcher
+
+    def call():
+        # A fresh fetcher per run: no connection reuse or cache across runs
+        extract_all_content_from_pdf(spec["pdf"], fetcher=WebFetcher(), ocr=spec["ocr"])
+    return call, lambda: spec["pages"]
+
+
+def run_generation(spec):
+    from deal_notes_generation import generate_deal_notes
+    from metric_generation_agent import metric_extraction_agent
+    with open(spec["data"], "r", encoding="utf-8") as f:
+        startup_information = json.load(f)
+    with open(os.path.join(REPO_ROOT, "config", "prompt", spec["prompt"]), "r", encoding="utf-8") as f:
+        prompt = f.read()
+    client = FakeGenAIClient(latency=spec["llm_latency"])
+    fn = generate_deal_notes if spec["task"] == "deal_notes" else metric_extraction_agent
+
+    def call():
+        if fn(prompt, startup_information, client) is None:
+            raise RuntimeError(f"{spec['task']} returned no result")
+    return call, lambda: 1
+
+
+def run_worker(spec):
+    call, units = run_ingest(spec) if spec["kind"] == "ingest" else run_generation(spec)
+    for _ in range(spec["warmup"]):
+        call()
+    seconds = []
+    for _ in range(spec["repeat"]):
+        start = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - start)
+    print(json.dumps({
+        "runs": len(seconds),
+        "units": spec["units"],
+        "throughput": round(units() * len(seconds) / sum(seconds), 3),
+        "mean_seconds": round(sum(seconds) / len(seconds), 4),
+        "p50_seconds": round(percentile(seconds, 50), 4),
+        "p95_seconds": round(percentile(seconds, 95), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
+
+
+def run_scenario(spec):
+    out = subprocess.run([sys.executable, __file__, "--worker", json.dumps(spec)],
+                         cwd=REPO_ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"scenario {spec['name']} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for field in COMPARED:
+            if previous.get(field) and result[field] > previous[field] * (1 + tolerance):
+                regressions.append(f"{name} {field}: {previous[field]} -> {result[field]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--decks", nargs="+", choices=sorted(DECKS), default=list(DECKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--ocr", action="store_true", help="OCR deck images (needs easyocr)")
+    parser.add_argument("--web-latency", type=float, default=0.05, help="seconds per stand-in web page")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio vs. baseline")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(json.loads(args.worker))
+        return
+
+    common = {"repeat": args.repeat, "warmup": args.warmup}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, LinkServer(latency=args.web_latency) as server:
+        specs = []
+        for deck in args.decks:
+            pages, images = DECKS[deck]
+            pdf = make_pdf(os.path.join(tmp, f"{deck}.pdf"), pages, images, link_base=server.base_url)
+            specs.append({"name": f"ingest_{deck}", "kind": "ingest", "pdf": pdf, "pages": pages,
+                          "ocr": args.ocr, "units": "pages/s", **common})
+        # Generation reads what ingestion produces for the largest selected deck
+        data_path = os.path.join(tmp, "extracted.json")
+        from test_input_agent import extract_all_content_from_pdf, save_all_data
+        save_all_data(extract_all_content_from_pdf(specs[-1]["pdf"], ocr=args.ocr), data_path)
+        for task, prompt in (("deal_notes", "deal_notes_generation.md"), ("metrics", "metric_generation.md")):
+            specs.append({"name": task, "kind": "generation", "task": task, "prompt": prompt, "data": data_path,
+                          "llm_latency": args.llm_latency, "units": "calls/s", **common})
+
+        print(f"{'scenario':16} {'throughput':>16} {'p50 s':>8} {'p95 s':>8} {'peak MB':>8}")
+        for spec in specs:
+            result = results[spec["name"]] = run_scenario(spec)
+            print(f"{spec['name']:16} {result['throughput']:8.2f} {result['units']:>7} "
+                  f"{result['p50_seconds']:8.3f} {result['p95_seconds']:8.3f} {result['peak_rss_mb']:8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "environment": {"python": platform.python_version(), "platform": platform.platform()},
+                "config": {"repeat": args.repeat, "warmup": args.warmup, "ocr": args.ocr,
+                           "web_latency": args.web_latency, "llm_latency": args.llm_latency,
+                           "decks": {deck: DECKS[deck] for deck in args.decks}},
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
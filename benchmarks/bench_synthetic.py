@@ -0,0 +1,112 @@
+"""Synthetic metric generation: per-value draws vs. one vectorized draw.
+
+Builds metric dicts of the shapes display_metrics sees (scalars, lists and
+{label: number} dicts, plus some non-numeric values) at several sizes, times
+the previous per-value implementation against generate_synthetic_from_llm,
+and checks both produce the same values.
+
+    python benchmarks/bench_synthetic.py --keys 1000 5000 20000 [--json out.json]
+"""
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from common import REPO_ROOT  # noqa: F401  (puts the repo on sys.path)
+from metric_generation_agent import classify_metrics, generate_synthetic_from_llm
+
+
+# The per-value implementation generate_synthetic_from_llm replaced
+def sequential_synthetic(llm_metrics):
+    synthetic = {}
+    rng = np.random.default_rng(seed=42)
+    for k, v in llm_metrics.items():
+        if isinstance(v, (int, float)):
+            noise = rng.uniform(0.9, 1.1)
+            synthetic[k] = round(v * noise, 2)
+        elif isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
+            synthetic[k] = [round(i * rng.uniform(0.9, 1.1), 2) for i in v]
+        elif isinstance(v, dict) and all(isinstance(val, (int, float)) for val in v.values()):
+            synthetic[k] = {kk: round(val * rng.uniform(0.9, 1.1), 2) for kk, val in v.items()}
+        else:
+            synthetic[k] = v
+    return synthetic
+
+
+def make_metrics(n_keys, seed=0):
+    rnd = random.Random(seed)
+    metrics = {}
+    for i in range(n_keys):
+        shape = i % 4
+        if shape == 0:
+            metrics[f"metric_{i}"] = rnd.uniform(0, 1e6)
+        elif shape == 1:
+            metrics[f"metric_{i}"] = [rnd.randint(0, 10000) for _ in range(rnd.randint(2, 12))]
+        elif shape == 2:
+            metrics[f"metric_{i}"] = {f"FY{20 + j}": rnd.uniform(0, 100) for j in range(rnd.randint(2, 6))}
+        else:
+            metrics[f"metric_{i}"] = f"{rnd.randint(1, 99)} crore"
+    return metrics
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def max_difference(a, b):
+    diff = 0.0
+    for k, v in a.items():
+        w = b[k]
+        if isinstance(v, list):
+            diff = max([diff] + [abs(x - y) for x, y in zip(v, w)])
+        elif isinstance(v, dict):
+            diff = max([diff] + [abs(v[kk] - w[kk]) for kk in v])
+        elif isinstance(v, float):
+            diff = max(diff, abs(v - w))
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'keys':>7} {'leaves':>8} {'sequential ms':>14} {'vectorized ms':>14} {'speedup':>8} {'max diff':>9}")
+    for n_keys in args.keys:
+        metrics = make_metrics(n_keys)
+        kinds = classify_metrics(metrics)
+        leaves = sum(1 if kinds[k] == "scalar" else len(v) for k, v in metrics.items() if kinds[k] != "other")
+        seq_seconds, expected = best_of(lambda: sequential_synthetic(metrics), args.repeat)
+        vec_seconds, actual = best_of(lambda: generate_synthetic_from_llm(metrics, kinds), args.repeat)
+        assert expected.keys() == actual.keys()
+        # np.round and round() may differ in the last digit on exact .xx5 ties
+        diff = max_difference(expected, actual)
+        assert diff <= 0.01 + 1e-9, diff
+        results.append({
+            "keys": n_keys,
+            "leaves": leaves,
+            "sequential_seconds": round(seq_seconds, 5),
+            "vectorized_seconds": round(vec_seconds, 5),
+            "speedup": round(seq_seconds / vec_seconds, 2),
+            "max_difference": diff,
+        })
+        print(f"{n_keys:7d} {leaves:8d} {seq_seconds * 1000:14.2f} {vec_seconds * 1000:14.2f} "
+              f"{seq_seconds / vec_seconds:7.1f}x {diff:9.2g}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Check that malformed links in a deck don't abort ingestion.
+
+Builds a deck linking to pages on the local stand-in server plus a few
+links urllib cannot parse (bad port, broken IPv6 literal), runs
+extract_all_content_from_pdf and asserts the good pages are fetched while
+each malformed link comes back as an error entry.
+
+    python benchmarks/check_links.py
+"""
+import os
+import tempfile
+
+from common import REPO_ROOT  # noqa: F401  (puts the repo on sys.path)
+from fixtures import LinkServer, make_pdf
+
+MALFORMED = ("http://host:abc/", "http://[::1/", "https://example.com:99999/")
+
+
+def main():
+    from test_input_agent import extract_all_content_from_pdf
+    from web_fetcher import WebFetcher
+
+    with tempfile.TemporaryDirectory() as tmp, LinkServer(latency=0.0, paragraphs=2) as server:
+        pdf = make_pdf(os.path.join(tmp, "deck.pdf"), pages=3, images=0, link_base=server.base_url,
+                       extra_links=MALFORMED)
+        result = extract_all_content_from_pdf(pdf, fetcher=WebFetcher(total_budget=10), ocr=False)
+
+    by_url = {entry["url"]: entry["content"] for entry in result["web_data"]}
+    for url in MALFORMED:
+        assert url in by_url, f"{url} missing from web_data"
+        assert by_url[url].get("error"), f"{url} should be reported as an error"
+    fetched = [url for url in by_url if url.startswith(server.base_url)]
+    assert len(fetched) == 3, fetched
+    for url in fetched:
+        assert not by_url[url].get("error") and by_url[url]["website_text"], url
+    print(f"ok: {len(fetched)} pages fetched, {len(MALFORMED)} malformed links reported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Check the LLM scheduler's retry, priority and rate-limit behaviour.
+
+Runs against the 429-injecting fake client and asserts that:
+  - throttled calls are retried until they succeed, and a 400 is not retried;
+  - with one slot, queued interactive requests are served before batch ones
+    that were queued earlier;
+  - a requests-per-minute limit spaces calls out.
+
+    python benchmarks/check_scheduler.py
+"""
+import threading
+import time
+
+from common import REPO_ROOT  # noqa: F401  (puts the repo on sys.path)
+from fixtures import DEAL_NOTES_RESPONSE, FakeAPIError, FakeGenAIClient
+from llm_cache import generate_text
+from llm_scheduler import BATCH, INTERACTIVE, LLMScheduler, TokenBucket
+
+
+def check_retry_then_success():
+    fake = FakeGenAIClient(latency=0.0, fail_first=3)
+    scheduler = LLMScheduler(retries=4, backoff=0.01)
+    text = generate_text(scheduler.client(fake, BATCH), "Deal notes", "startup")
+    stats = scheduler.stats()
+    assert text == DEAL_NOTES_RESPONSE, text
+    assert fake.calls == 4, fake.calls
+    assert (stats["throttled"], stats["retries"], stats["completed"], stats["failed"]) == (3, 3, 1, 0), stats
+
+    fake = FakeGenAIClient(latency=0.0, fail_first=1, error_code=400)
+    scheduler = LLMScheduler(retries=4, backoff=0.01)
+    try:
+        generate_text(scheduler.client(fake), "Deal notes", "startup")
+    except FakeAPIError as e:
+        assert e.code == 400
+    else:
+        raise AssertionError("a 400 should not be retried")
+    assert fake.calls == 1 and scheduler.stats()["failed"] == 1, (fake.calls, scheduler.stats())
+
+
+def _wait_for_queue(scheduler, depth, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while scheduler.stats()["queue_depth"] < depth:
+        assert time.monotonic() < deadline, scheduler.stats()
+        time.sleep(0.005)
+
+
+def check_priority_order():
+    scheduler = LLMScheduler(max_concurrency=1)
+    release = threading.Event()
+    order = []
+    threads = []
+
+    def submit(priority, name, call=None):
+        call = call or (lambda: order.append(name))
+        thread = threading.Thread(target=scheduler.run, args=(call, priority))
+        thread.start()
+        threads.append(thread)
+
+    # Hold the only slot while both priorities queue up behind it
+    submit(BATCH, "holder", lambda: release.wait(5))
+    while scheduler.stats()["in_flight"] < 1:
+        time.sleep(0.005)
+    for i in range(3):
+        submit(BATCH, f"batch {i}")
+        _wait_for_queue(scheduler, i + 1)
+    for i in range(2):
+        submit(INTERACTIVE, f"interactive {i}")
+        _wait_for_queue(scheduler, 4 + i)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive 0", "interactive 1", "batch 0", "batch 1", "batch 2"], order
+
+
+def check_rpm_wait():
+    scheduler = LLMScheduler(max_concurrency=4, requests_per_minute=600)
+    # A one-request burst, so the 10 requests/second limit shows from the second call
+    scheduler.request_bucket = TokenBucket(600, capacity=1)
+    fake = FakeGenAIClient(latency=0.0)
+    client = scheduler.client(fake, BATCH)
+    start = time.perf_counter()
+    for i in range(5):
+        generate_text(client, "Deal notes", f"startup {i}")
+    elapsed = time.perf_counter() - start
+    waits = scheduler.stats()["wait_seconds"][BATCH]
+    assert elapsed >= 0.35, elapsed
+    assert waits["max"] >= 0.05, waits
+
+
+def main():
+    for check in (check_retry_then_success, check_priority_order, check_rpm_wait):
+        check()
+        print(f"ok: {check.__name__}")
+
+
+if __name__ == "__main__":
+    main()
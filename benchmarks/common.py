@@ -0,0 +1,28 @@
+import os
+import sys
+import resource
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def input_decks():
+    decks = []
+    for root, dirs, files in os.walk(os.path.join(REPO_ROOT, "data", "input")):
+        dirs[:] = [d for d in dirs if d != "__MACOSX"]
+        decks.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+    return sorted(decks)
+
+
+# Nearest-rank percentile (p in [0, 100]) of a non-empty list of samples
+def percentile(values, p):
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
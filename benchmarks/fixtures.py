@@ -0,0 +1,148 @@
+"""Synthetic inputs for the benchmark suite: PDF decks, a local stand-in for
+the web pages they link to, and a fake genai client with fixed latency."""
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+WORDS = ("revenue growth team founder market customers retention churn funding traction "
+         "distribution margin product users orders valuation competitors pricing").split()
+
+
+# A deck of `pages` pages, each with a paragraph of text, `images` distinct
+# PNG images and a link to one of `links` pages under link_base; extra_links
+# are added verbatim to the first page
+def make_pdf(path, pages, images, link_base=None, links=3, seed=0, extra_links=()):
+    import fitz  # PyMuPDF
+    from PIL import Image
+    rnd = random.Random(seed)
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        text = " ".join(rnd.choice(WORDS) for _ in range(120))
+        page.insert_textbox(fitz.Rect(72, 72, 540, 300), f"Slide {p}: {text}", fontsize=10)
+        for i in range(images):
+            image = Image.new("RGB", (120 + p % 7, 80 + i), (rnd.randrange(256), rnd.randrange(256), 120))
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG")
+            top = 320 + 90 * (i % 5)
+            page.insert_image(fitz.Rect(72 + 110 * (i // 5), top, 172 + 110 * (i // 5), top + 80),
+                              stream=buffer.getvalue())
+        if link_base and links:
+            page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 40, 300, 60),
+                              "uri": f"{link_base}/page{p % links}"})
+        if p == 0:
+            for i, uri in enumerate(extra_links):
+                page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(320, 40 + 20 * i, 540, 60 + 20 * i),
+                                  "uri": uri})
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        paragraphs = "".join(f"<p>{self.path} {' '.join(WORDS)}</p>" for _ in range(self.server.paragraphs))
+        body = (f"<html><body>{paragraphs}"
+                "<figure><img src='/chart.png' alt='chart'><figcaption>Revenue by quarter</figcaption></figure>"
+                "<svg aria-label='growth chart'></svg></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Local HTTP server standing in for the websites linked from the decks.
+# Used as a context manager; base_url is known once it is listening.
+class LinkServer:
+    def __init__(self, latency=0.05, paragraphs=20):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.paragraphs = paragraphs
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+METRICS_RESPONSE = json.dumps([
+    {"metric": "Revenue", "value": "5 crore", "unit": "INR", "time_frame": "FY24", "section": "Traction"},
+    {"metric": "Revenue", "value": "9 crore", "unit": "INR", "time_frame": "FY25", "section": "Traction"},
+    {"metric": "Active Users", "value": 15000, "unit": "users", "time_frame": "FY25", "section": "Traction"},
+    {"metric": "Gross Margin", "value": "42%", "unit": "%", "time_frame": "FY25", "section": "Financials"},
+])
+DEAL_NOTES_RESPONSE = "\n".join(
+    f"## {section}\n- " + " ".join(WORDS) for section in ("Team", "Product", "Market", "Traction", "Risks", "Ask")
+)
+
+
+# Stands in for google.genai.errors.APIError: the HTTP status is on .code
+class FakeAPIError(Exception):
+    def __init__(self, code=429):
+        super().__init__(f"{code} RESOURCE_EXHAUSTED" if code == 429 else f"{code} error")
+        self.code = code
+
+
+class _FakeModels:
+    def __init__(self, client):
+        self.client = client
+
+    def _respond(self, contents):
+        prompt = contents[0]["parts"][0]["text"]
+        with self.client.lock:
+            self.client.calls += 1
+            failing = (self.client.calls <= self.client.fail_first
+                       or self.client.rng.random() < self.client.error_rate)
+            if failing:
+                self.client.errors += 1
+        if failing:
+            raise FakeAPIError(self.client.error_code)
+        # The metric prompt's title mentions metrics; everything else gets deal notes
+        text = METRICS_RESPONSE if "metric" in prompt.splitlines()[0].lower() else DEAL_NOTES_RESPONSE
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4 + 1, candidates_token_count=len(text) // 4 + 1)
+        return text, usage
+
+    def generate_content(self, model, contents):
+        time.sleep(self.client.latency)
+        text, usage = self._respond(contents)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def generate_content_stream(self, model, contents):
+        text, usage = self._respond(contents)
+        parts = text.split("\n## ")
+        for i, part in enumerate(parts):
+            time.sleep(self.client.latency / len(parts))
+            yield SimpleNamespace(text=("\n## " if i else "") + part,
+                                  usage_metadata=usage if i == len(parts) - 1 else None)
+
+
+# Drop-in for google.genai.Client: same models.generate_content(_stream)
+# surface, fixed latency per call, canned deal-notes / metrics responses.
+# error_rate injects 429s (FakeAPIError) into that share of calls, and the
+# first fail_first calls always fail; error_code changes the status raised.
+class FakeGenAIClient:
+    def __init__(self, latency=0.2, error_rate=0.0, seed=0, fail_first=0, error_code=429):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_code = error_code
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+        self.models = _FakeModels(self)
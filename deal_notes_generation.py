@@ -1,15 +1,18 @@
 import os
+import io
 import json
-from dotenv import load_dotenv
-from google import genai
-from docx import Document
+import time
+from retrieval import DEAL_NOTES_QUERY, DEFAULT_TOKEN_BUDGET, build_llm_input
+from llm_cache import generate_text, generate_text_stream
 
 def read_docx(file_path):
+    from docx import Document
     doc = Document(file_path)
     content = "\n\n".join([para.text for para in doc.paragraphs if para.text.strip() != ""])
     return content
 
-def save_to_docx(text, filename):
+def build_docx(text):
+    from docx import Document
     doc = Document()
     doc.add_heading("Deal Notes Generation", 0)
     if text is None:
@@ -17,33 +20,50 @@ def save_to_docx(text, filename):
     else:
         for paragraph in text.split('\n\n'):
             doc.add_paragraph(paragraph)
-    doc.save(filename)
+    return doc
+
+def save_to_docx(text, filename):
+    build_docx(text).save(filename)
+
+# DOCX built straight from the in-memory text, for download buttons
+def docx_bytes(text):
+    buffer = io.BytesIO()
+    build_docx(text).save(buffer)
+    return buffer.getvalue()
 
 def read_data(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     return data
 
-def generate_deal_notes(deal_notes_prompt, startup_information, client):
-    full_input = (
-        f"{deal_notes_prompt}\n\n"
-        "Here is the extracted startup data in JSON format:\n"
-        f"{json.dumps(startup_information, indent=2)}"
-    )
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[
-            {
-                "role": "user",
-                "parts": [{"text": full_input}]
-            }
-        ]
-    )
-    # Defensive: check that response.text is not None
-    return getattr(response, "text", None)
+def generate_deal_notes(deal_notes_prompt, startup_information, client, token_budget=DEFAULT_TOKEN_BUDGET,
+                        cache=None, refresh=False):
+    # token_budget=None sends the whole extracted data instead of the top-ranked chunks;
+    # cache is an llm_cache.LLMCache, refresh=True bypasses it for this call
+    full_input = build_llm_input(deal_notes_prompt, "extracted startup data", startup_information,
+                                 DEAL_NOTES_QUERY, token_budget)
+    return generate_text(client, deal_notes_prompt, full_input, cache=cache, refresh=refresh)
 
-def display_deal_notes(notes_text, st):
-    st.markdown("""
+# Same input as generate_deal_notes, but yields text fragments as they arrive
+def generate_deal_notes_stream(deal_notes_prompt, startup_information, client, token_budget=DEFAULT_TOKEN_BUDGET,
+                               cache=None, refresh=False):
+    full_input = build_llm_input(deal_notes_prompt, "extracted startup data", startup_information,
+                                 DEAL_NOTES_QUERY, token_budget)
+    return generate_text_stream(client, deal_notes_prompt, full_input, cache=cache, refresh=refresh)
+
+# Regroup streamed fragments into complete '\n\n'-delimited sections
+def iter_note_sections(fragments):
+    buffer = ""
+    for fragment in fragments:
+        buffer += fragment
+        *sections, buffer = buffer.split('\n\n')
+        for section in sections:
+            if section.strip():
+                yield section
+    if buffer.strip():
+        yield buffer
+
+NOTES_STYLE = """
         <style>
         .section {
             background: #eaf6ff; border-radius: 10px; padding: 12px; margin-bottom: 12px; color: #0a2540; font-size: 16px;
@@ -61,7 +81,23 @@ def display_deal_notes(notes_text, st):
             background: #fff7d6; border-radius: 10px; padding: 12px; margin-bottom: 12px; color: #ff8f00; font-size: 16px;
         }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+def render_note_section(section):
+    section_lower = section.lower()
+    if 'summary' in section_lower:
+        return f'<div class="summary">📝 <b>Summary:</b><br>{section}</div>'
+    elif 'strength' in section_lower or 'positive' in section_lower:
+        return f'<div class="strength">💪 <b>Strengths:</b><br>{section}</div>'
+    elif 'risk' in section_lower or 'concern' in section_lower:
+        return f'<div class="risk">⚠️ <b>Risks:</b><br>{section}</div>'
+    elif 'recommendation' in section_lower or 'suggestion' in section_lower:
+        return f'<div class="recommendation">🔖 <b>Recommendations:</b><br>{section}</div>'
+    else:
+        return f'<div class="section">{section}</div>'
+
+def display_deal_notes(notes_text, st):
+    st.markdown(NOTES_STYLE, unsafe_allow_html=True)
 
     if not notes_text:
         st.warning("No deal notes to display. Please generate deal notes first.")
@@ -69,14 +105,24 @@ def display_deal_notes(notes_text, st):
 
     sections = notes_text.split('\n\n')
     for section in sections:
-        section_lower = section.lower()
-        if 'summary' in section_lower:
-            st.markdown(f'<div class="summary">📝 <b>Summary:</b><br>{section}</div>', unsafe_allow_html=True)
-        elif 'strength' in section_lower or 'positive' in section_lower:
-            st.markdown(f'<div class="strength">💪 <b>Strengths:</b><br>{section}</div>', unsafe_allow_html=True)
-        elif 'risk' in section_lower or 'concern' in section_lower:
-            st.markdown(f'<div class="risk">⚠️ <b>Risks:</b><br>{section}</div>', unsafe_allow_html=True)
-        elif 'recommendation' in section_lower or 'suggestion' in section_lower:
-            st.markdown(f'<div class="recommendation">🔖 <b>Recommendations:</b><br>{section}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'<div class="section">{section}</div>', unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown(render_note_section(section), unsafe_allow_html=True)
+
+# Render sections as soon as each one is complete. Returns the full text and
+# timings (time_to_first_section is None if nothing was generated).
+def display_deal_notes_stream(fragments, st):
+    st.markdown(NOTES_STYLE, unsafe_allow_html=True)
+    start = time.perf_counter()
+    time_to_first_section = None
+    sections = []
+    for section in iter_note_sections(fragments):
+        if time_to_first_section is None:
+            time_to_first_section = time.perf_counter() - start
+        sections.append(section)
+        st.markdown(render_note_section(section), unsafe_allow_html=True)
+    if not sections:
+        st.warning("No deal notes to display. Please generate deal notes first.")
+    return {
+        "text": '\n\n'.join(sections) if sections else None,
+        "time_to_first_section": time_to_first_section,
+        "total_seconds": time.perf_counter() - start
+    }
@@ -1,15 +1,33 @@
+import os
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
 import speech_recognition as sr
+from file_cache import FileCache
+
+DEFAULT_TRANSCRIPT_CACHE_DIR = os.path.join(".cache", "transcripts")
+DEFAULT_CHUNK_SECONDS = 30.0
+DEFAULT_SILENCE_SEARCH_SECONDS = 5.0
+SILENCE_BLOCK_SECONDS = 0.02
 
-def transcribe_audio_to_text(audio_file_path):
+def transcribe_audio_to_text(audio_file_path, chunk_seconds=None, **chunk_options):
     """
     Transcribes speech from an audio file to text using Google's Speech Recognition API.
 
     Args:
         audio_file_path (str): Path to the audio file (supported formats: WAV, AIFF, FLAC).
+        chunk_seconds (float, optional): If given, transcribe in chunks of about this
+            length through transcribe_audio_chunked (chunk_options are passed on).
 
     Returns:
         str: Transcribed text from the audio.
     """
+    if chunk_seconds is not None:
+        return transcribe_audio_chunked(audio_file_path, chunk_seconds=chunk_seconds, **chunk_options)["text"]
     recognizer = sr.Recognizer()
     with sr.AudioFile(audio_file_path) as source:
         audio_data = recognizer.record(source)
@@ -19,4 +37,217 @@ def transcribe_audio_to_text(audio_file_path):
     except sr.UnknownValueError:
         return "Could not understand audio"
     except sr.RequestError as e:
-        return f"Could not request results from Google Speech Recognition service; {e}"
\ No newline at end of file
+        return f"Could not request results from Google Speech Recognition service; {e}"
+
+
+class GoogleRecognizerBackend:
+    """
+    Recognizer backend for the chunked mode: Google's Speech Recognition API.
+
+    A backend needs a `name` (part of the transcript cache key) and a
+    `transcribe(audio_data) -> str` that raises sr.UnknownValueError when
+    nothing intelligible was said.
+    """
+
+    def __init__(self, language="en-US"):
+        self.language = language
+        self.name = f"google:{language}"
+
+    def transcribe(self, audio_data):
+        return sr.Recognizer().recognize_google(audio_data, language=self.language)
+
+
+class StandInRecognizerBackend:
+    """
+    Local recognizer backend for tests and benchmarks: no network, optional
+    fixed latency, and a deterministic "transcript" derived from the chunk's
+    samples, so ordering and caching can be checked without a speech service.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.name = "stand-in"
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_data):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+        raw = audio_data.get_raw_data()
+        if not any(raw):
+            raise sr.UnknownValueError()
+        seconds = len(raw) / (audio_data.sample_rate * audio_data.sample_width)
+        return f"chunk {hashlib.sha1(raw).hexdigest()[:8]} ({seconds:.1f}s)"
+
+
+class TranscriptCache(FileCache):
+    """
+    Per-chunk transcripts on disk (one JSON file per chunk, LRU eviction),
+    keyed by the chunk's audio content and the recognizer backend.
+    """
+
+    def __init__(self, directory=DEFAULT_TRANSCRIPT_CACHE_DIR, **options):
+        super().__init__(directory, **options)
+
+    @staticmethod
+    def key(audio_data, backend_name):
+        digest = hashlib.sha256(audio_data.get_raw_data()).hexdigest()
+        raw = f"{digest}|{audio_data.sample_rate}|{audio_data.sample_width}|{backend_name}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _samples(buffer, sample_width):
+    # PCM bytes (little endian, mono) as signed integers; numpy instead of audioop,
+    # which is gone from the standard library as of Python 3.13
+    import numpy as np
+    if sample_width == 1:
+        return np.frombuffer(buffer, dtype=np.uint8).astype(np.int16) - 128
+    if sample_width == 3:
+        raw = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        return np.where(values >= 1 << 23, values - (1 << 24), values)
+    return np.frombuffer(buffer, dtype={2: np.int16, 4: np.int32}[sample_width])
+
+
+def _quietest_frame(buffer, sample_width, sample_rate, start_frame, stop_frame):
+    # Middle of the lowest-energy block in [start_frame, stop_frame); the latest
+    # one on ties, so chunks stay close to the requested length
+    samples = _samples(buffer[start_frame * sample_width:stop_frame * sample_width], sample_width)
+    block = max(1, int(sample_rate * SILENCE_BLOCK_SECONDS))
+    blocks = len(samples) // block
+    if blocks == 0:
+        return stop_frame
+    energy = abs(samples[:blocks * block].reshape(blocks, block).astype("float64")).mean(axis=1)
+    quietest = blocks - 1 - int(energy[::-1].argmin())
+    return start_frame + quietest * block + block // 2
+
+
+def iter_audio_chunks(audio_file_path, chunk_seconds=DEFAULT_CHUNK_SECONDS,
+                      silence_search_seconds=DEFAULT_SILENCE_SEARCH_SECONDS) -> Iterator[Dict[str, Any]]:
+    """
+    Reads an audio file incrementally and yields consecutive chunks of at most
+    chunk_seconds. Each cut is moved back to the quietest point within the
+    last silence_search_seconds of the chunk, so words are not split;
+    silence_search_seconds=0 gives fixed-length chunks.
+
+    Yields:
+        dict: {"index", "start", "end" (seconds), "audio" (sr.AudioData)}
+    """
+    with sr.AudioFile(audio_file_path) as source:
+        rate, width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+        chunk_frames = max(1, int(chunk_seconds * rate))
+        search_frames = min(chunk_frames - 1, int(silence_search_seconds * rate))
+        buffer = b""
+        offset = 0  # frames already emitted
+        index = 0
+        exhausted = False
+        while not exhausted or buffer:
+            # Read past the chunk boundary so a cut point can be chosen before it
+            while not exhausted and len(buffer) <= chunk_frames * width:
+                data = source.stream.read(chunk_frames)
+                exhausted = not data
+                buffer += data
+            frames = len(buffer) // width
+            cut = frames
+            if frames > chunk_frames:
+                cut = chunk_frames
+                if search_frames > 0:
+                    cut = _quietest_frame(buffer, width, rate, chunk_frames - search_frames, chunk_frames)
+            if cut == 0:
+                break
+            yield {
+                "index": index,
+                "start": offset / rate,
+                "end": (offset + cut) / rate,
+                "audio": sr.AudioData(buffer[:cut * width], rate, width),
+            }
+            buffer = buffer[cut * width:]
+            offset += cut
+            index += 1
+
+
+def _transcribe_chunk(chunk, backend, cache):
+    segment = {"index": chunk["index"], "start": chunk["start"], "end": chunk["end"],
+               "text": "", "cached": False, "error": None}
+    key = TranscriptCache.key(chunk["audio"], backend.name) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            segment.update(text=cached, cached=True)
+            return segment
+    try:
+        segment["text"] = backend.transcribe(chunk["audio"])
+    except sr.UnknownValueError:
+        # Silence or noise: an empty transcript, worth caching like any other
+        segment["text"] = ""
+    except Exception as e:
+        segment["error"] = str(e)
+        return segment
+    if cache is not None:
+        cache.put(key, segment["text"])
+    return segment
+
+
+def iter_transcript(audio_file_path, backend=None, cache: Optional[TranscriptCache] = None, max_workers=4,
+                    chunk_seconds=DEFAULT_CHUNK_SECONDS,
+                    silence_search_seconds=DEFAULT_SILENCE_SEARCH_SECONDS) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming transcription: chunks are transcribed concurrently and the
+    segments are yielded in order as soon as each one and all before it are
+    done. At most 2 * max_workers chunks are held in memory. A failed chunk
+    yields a segment with "error" set instead of failing the whole call;
+    chunks found in cache are not sent to the backend.
+
+    Yields:
+        dict: {"index", "start", "end", "text", "cached", "error"}
+    """
+    backend = backend or GoogleRecognizerBackend()
+    chunks = iter_audio_chunks(audio_file_path, chunk_seconds, silence_search_seconds)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcribe") as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_transcribe_chunk, chunk, backend, cache))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def format_timestamp(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def transcribe_audio_chunked(audio_file_path, on_segment=None, **options):
+    """
+    Chunked transcription of a whole file (options as for iter_transcript).
+
+    Args:
+        audio_file_path (str): Path to the audio file (WAV, AIFF, FLAC).
+        on_segment (callable, optional): Called with each segment, in order, for progress.
+
+    Returns:
+        dict: {"text": stitched transcript, "timestamped_text": one "[hh:mm:ss] text"
+        line per segment, "segments": list, "stats": chunk, cache and timing counts}
+    """
+    start = time.perf_counter()
+    segments = []
+    for segment in iter_transcript(audio_file_path, **options):
+        segments.append(segment)
+        if on_segment is not None:
+            on_segment(segment)
+    spoken = [segment for segment in segments if segment["text"]]
+    return {
+        "text": " ".join(segment["text"] for segment in spoken),
+        "timestamped_text": "\n".join(f"[{format_timestamp(segment['start'])}] {segment['text']}"
+                                      for segment in spoken),
+        "segments": segments,
+        "stats": {
+            "chunks": len(segments),
+            "cached": sum(segment["cached"] for segment in segments),
+            "failed": sum(segment["error"] is not None for segment in segments),
+            "audio_seconds": round(segments[-1]["end"], 3) if segments else 0.0,
+            "seconds": round(time.perf_counter() - start, 4),
+        },
+    }
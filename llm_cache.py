@@ -0,0 +1,165 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import closing, contextmanager
+from typing import Iterator, Optional
+
+import tracing
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_LLM_CACHE_PATH = os.path.join(".cache", "llm.sqlite3")
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_LLM_CACHE_MAX_ENTRIES = 500
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Local SQLite cache of model responses keyed by model name, prompt hash and
+# input hash. Entries expire after ttl seconds; past max_entries the least
+# recently used rows are dropped. Each call opens its own connection so the
+# cache can be shared between threads.
+class LLMCache:
+    def __init__(self, path: str = DEFAULT_LLM_CACHE_PATH, ttl: float = DEFAULT_LLM_CACHE_TTL,
+                 max_entries: int = DEFAULT_LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, text TEXT, created_at REAL, last_used REAL)"
+            )
+
+    # One transaction on a fresh connection. sqlite3's own context manager
+    # only commits or rolls back, so closing() is what releases the handle.
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def key(model: str, prompt: str, input_text: str) -> str:
+        return _sha256(f"{model}|{_sha256(prompt)}|{_sha256(input_text)}")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] >= self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return row[0] if row is not None else None
+
+    def put(self, key: str, model: str, text: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, text, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, text, now, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+# Prompt/response token counters: the API's usage metadata when the response
+# carries it, otherwise the chars/4 estimate
+def _count_tokens(response, full_input: str, text: Optional[str]) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    response_tokens = getattr(usage, "candidates_token_count", None)
+    tracing.count("llm.prompt_tokens", prompt_tokens if prompt_tokens is not None else len(full_input) // 4 + 1)
+    tracing.count("llm.response_tokens",
+                  response_tokens if response_tokens is not None else len(text or "") // 4 + 1)
+
+
+# Single place the agents call the model. With a cache, an identical
+# (model, prompt, input) returns the stored text without a request;
+# refresh=True skips the lookup and overwrites the entry.
+def generate_text(client, prompt: str, full_input: str, model: str = DEFAULT_MODEL,
+                  cache: LLMCache = None, refresh: bool = False) -> Optional[str]:
+    key = LLMCache.key(model, prompt, full_input) if cache is not None else None
+    with tracing.span("llm.generate_text", model=model, input_chars=len(full_input)) as llm_span:
+        if cache is not None and not refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                tracing.count("llm.cache_hits")
+                llm_span.set(cache="hit")
+                return cached
+        response = client.models.generate_content(
+            model=model,
+            contents=[
+                {
+                    "role": "user",
+                    "parts": [{"text": full_input}]
+                }
+            ]
+        )
+        # Defensive: check that response.text is not None
+        text = getattr(response, "text", None)
+        tracing.count("llm.calls")
+        _count_tokens(response, full_input, text)
+        if cache is not None and text is not None:
+            cache.put(key, model, text)
+        return text
+
+
+# Streaming variant of generate_text: yields text fragments as the model
+# produces them. A cache hit yields the stored text in one piece; the full
+# streamed text is cached once the stream is exhausted.
+def generate_text_stream(client, prompt: str, full_input: str, model: str = DEFAULT_MODEL,
+                         cache: LLMCache = None, refresh: bool = False) -> Iterator[str]:
+    key = LLMCache.key(model, prompt, full_input) if cache is not None else None
+    # The span also covers the time the caller spends between fragments
+    with tracing.span("llm.generate_text_stream", model=model, input_chars=len(full_input)) as llm_span:
+        if cache is not None and not refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                tracing.count("llm.cache_hits")
+                llm_span.set(cache="hit")
+                yield cached
+                return
+        parts = []
+        chunk = None
+        start = time.perf_counter()
+        for chunk in client.models.generate_content_stream(
+            model=model,
+            contents=[
+                {
+                    "role": "user",
+                    "parts": [{"text": full_input}]
+                }
+            ]
+        ):
+            text = getattr(chunk, "text", None)
+            if text:
+                if not parts:
+                    llm_span.set(first_chunk_seconds=round(time.perf_counter() - start, 4))
+                parts.append(text)
+                yield text
+        tracing.count("llm.calls")
+        _count_tokens(chunk, full_input, "".join(parts))
+        if cache is not None and parts:
+            cache.put(key, model, "".join(parts))
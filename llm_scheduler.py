@@ -0,0 +1,286 @@
+import os
+import time
+import heapq
+import random
+import functools
+import itertools
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+import tracing
+from retrieval import estimate_tokens
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)  # served strictly in this order
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+WAIT_SAMPLES = 1000
+
+
+# Refills continuously at rate_per_minute / 60 per second up to capacity
+# (one minute's worth by default). Balance may go negative when a request's
+# actual token usage turns out higher than its estimate.
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.balance = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.balance = min(self.capacity, self.balance + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Seconds until `amount` can be taken (0 if it can be taken now)
+    def time_until(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.balance >= amount else (amount - self.balance) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.balance = min(self.capacity, self.balance - min(amount, self.capacity))
+
+
+def _status(error: Exception) -> Optional[int]:
+    # google.genai errors carry the HTTP status as .code; be lenient about the name
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    # requests.HTTPError and httpx.HTTPStatusError keep it on the response
+    value = getattr(getattr(error, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+# Connection-level failures of the HTTP clients in play: httpx under the
+# genai SDK, requests elsewhere in the repo. Imported lazily, as either may
+# be missing.
+@functools.lru_cache(maxsize=1)
+def _transport_errors() -> tuple:
+    errors = [ConnectionError, TimeoutError]
+    try:
+        import httpx
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors.append(requests.RequestException)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+# Retry on 429/5xx, and on failures that never got an HTTP status at all
+def is_transient(error: Exception) -> bool:
+    status = _status(error)
+    if status is not None:
+        return status in RETRY_STATUSES
+    return isinstance(error, _transport_errors())
+
+
+def _request_tokens(contents: Any) -> int:
+    if isinstance(contents, str):
+        return estimate_tokens(contents)
+    texts = [part.get("text", "") for message in contents or [] if isinstance(message, dict)
+             for part in message.get("parts", []) if isinstance(part, dict)]
+    return estimate_tokens("".join(texts))
+
+
+def _wait_summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": round(ordered[(len(ordered) - 1) // 2], 4),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+# Shared gate in front of the model API for everything in this process: at
+# most max_concurrency requests in flight, optional requests- and
+# tokens-per-minute buckets, strict priority of interactive over batch work
+# (FIFO within a priority), and jittered exponential backoff on 429/5xx and
+# connection errors. Wrap a genai client with client() to route its calls here.
+class LLMScheduler:
+    def __init__(self, max_concurrency: int = 4, requests_per_minute: float = None,
+                 tokens_per_minute: float = None, retries: int = 4, backoff: float = 1.0,
+                 max_backoff: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._cond = threading.Condition()
+        self._queue: List[tuple] = []  # (priority rank, sequence, tokens)
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._counts = {name: 0 for name in ("requests", "completed", "failed", "retries", "throttled")}
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES}
+
+    # LLM_MAX_CONCURRENCY, LLM_RPM and LLM_TPM override the defaults
+    @classmethod
+    def from_env(cls, **options) -> "LLMScheduler":
+        env = {"max_concurrency": ("LLM_MAX_CONCURRENCY", int),
+               "requests_per_minute": ("LLM_RPM", float),
+               "tokens_per_minute": ("LLM_TPM", float)}
+        for option, (name, cast) in env.items():
+            if os.environ.get(name):
+                options.setdefault(option, cast(os.environ[name]))
+        return cls(**options)
+
+    def client(self, client, priority: str = INTERACTIVE) -> "ScheduledClient":
+        return ScheduledClient(client, self, priority)
+
+    def _delay(self, tokens: int) -> float:
+        delays = [0.0]
+        if self.request_bucket is not None:
+            delays.append(self.request_bucket.time_until(1))
+        if self.token_bucket is not None:
+            delays.append(self.token_bucket.time_until(tokens))
+        return max(delays)
+
+    # Block until this request is first in line, a slot is free and the
+    # buckets can cover it; returns the seconds spent waiting
+    def acquire(self, priority: str, tokens: int) -> float:
+        start = time.monotonic()
+        entry = (PRIORITIES.index(priority), next(self._sequence), tokens)
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            while True:
+                if self._queue[0] is entry and self._in_flight < self.max_concurrency:
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            heapq.heappop(self._queue)
+            self._in_flight += 1
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1)
+            if self.token_bucket is not None:
+                self.token_bucket.consume(tokens)
+            waited = time.monotonic() - start
+            self._waits[priority].append(waited)
+            self._counts["requests"] += 1
+            self._cond.notify_all()
+        return waited
+
+    # actual_tokens (from usage metadata) corrects the token bucket for the
+    # difference from the estimate taken at acquire time
+    def release(self, estimated_tokens: int = 0, actual_tokens: int = None) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if self.token_bucket is not None and actual_tokens is not None:
+                self.token_bucket.consume(actual_tokens - estimated_tokens)
+            self._cond.notify_all()
+
+    def count(self, name: str) -> None:
+        with self._cond:
+            self._counts[name] += 1
+        tracing.count(f"llm.scheduler.{name}")
+
+    def backoff_seconds(self, attempt: int) -> float:
+        return min(self.max_backoff, self.backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+    # Run call() under the scheduler, retrying transient errors with backoff.
+    # The slot is given back while sleeping so other requests can proceed.
+    def run(self, call, priority: str = INTERACTIVE, tokens: int = 0):
+        attempt = 0
+        while True:
+            with tracing.span("llm.queue_wait", priority=priority) as wait_span:
+                wait_span.set(seconds=round(self.acquire(priority, tokens), 4))
+            error = response = None
+            try:
+                response = call()
+            except Exception as e:
+                error = e
+            finally:
+                self.release(tokens, None if error else _usage_tokens(response))
+            if error is None:
+                self.count("completed")
+                return response
+            self.retry_or_raise(error, attempt)
+            attempt += 1
+
+    # Count the failure, then sleep before the next attempt or re-raise
+    def retry_or_raise(self, error: Exception, attempt: int, retryable: bool = True) -> None:
+        if _status(error) == 429:
+            self.count("throttled")
+        if not retryable or not is_transient(error) or attempt >= self.retries:
+            self.count("failed")
+            raise error
+        self.count("retries")
+        time.sleep(self.backoff_seconds(attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self._in_flight,
+                **self._counts,
+                "wait_seconds": {priority: _wait_summary(list(samples)) for priority, samples in self._waits.items()},
+            }
+
+
+def _usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    prompt = getattr(usage, "prompt_token_count", None)
+    if prompt is None:
+        return None
+    return prompt + (getattr(usage, "candidates_token_count", None) or 0)
+
+
+class _ScheduledModels:
+    def __init__(self, owner: "ScheduledClient"):
+        self.owner = owner
+
+    def generate_content(self, model, contents, **kwargs):
+        scheduler, models = self.owner.scheduler, self.owner.wrapped.models
+        return scheduler.run(lambda: models.generate_content(model=model, contents=contents, **kwargs),
+                             self.owner.priority, _request_tokens(contents))
+
+    # The slot is held until the stream is exhausted; errors are only retried
+    # before the first chunk has been handed to the caller
+    def generate_content_stream(self, model, contents, **kwargs) -> Iterator[Any]:
+        scheduler, models = self.owner.scheduler, self.owner.wrapped.models
+        tokens = _request_tokens(contents)
+        attempt = 0
+        while True:
+            scheduler.acquire(self.owner.priority, tokens)
+            error = last = None
+            try:
+                for last in models.generate_content_stream(model=model, contents=contents, **kwargs):
+                    yield last
+            except Exception as e:
+                error = e
+            finally:
+                scheduler.release(tokens, None if error else _usage_tokens(last))
+            if error is None:
+                scheduler.count("completed")
+                return
+            scheduler.retry_or_raise(error, attempt, retryable=last is None)
+            attempt += 1
+
+
+# Drop-in for a genai client (client.models.generate_content[_stream]) whose
+# calls go through an LLMScheduler at the given priority
+class ScheduledClient:
+    def __init__(self, client, scheduler: LLMScheduler, priority: str = INTERACTIVE):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+        self.wrapped = client
+        self.scheduler = scheduler
+        self.priority = priority
+        self.models = _ScheduledModels(self)
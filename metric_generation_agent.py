@@ -1,76 +1,111 @@
 import os
 import json
-from dotenv import load_dotenv
-from google import genai
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
+from retrieval import METRIC_QUERY, DEFAULT_TOKEN_BUDGET, build_llm_input
+from llm_cache import generate_text
+import tracing
 
 def read_data(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     return data
 
-def metric_extraction_agent(metric_extraction_prompt, startup_information, client):
-    full_input = (
-        f"{metric_extraction_prompt}\n\n"
-        "Here is the startup summary data in JSON format:\n"
-        f"{json.dumps(startup_information, indent=2)}"
-    )
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=[
-            {
-                "role": "user",
-                "parts": [{"text": full_input}]
-            }
-        ]
-    )
-    metrics_json_str = response.text
-    try:
-        metrics_json_obj = json.loads(metrics_json_str)
-    except json.JSONDecodeError:
+# Ask the model for metrics and parse them; None if the output is not JSON
+def extract_metrics(metric_extraction_prompt, startup_information, client, token_budget=DEFAULT_TOKEN_BUDGET,
+                    cache=None, refresh=False):
+    # token_budget=None sends the whole extracted data instead of the top-ranked chunks;
+    # cache is an llm_cache.LLMCache, refresh=True bypasses it for this call
+    full_input = build_llm_input(metric_extraction_prompt, "startup summary data", startup_information,
+                                 METRIC_QUERY, token_budget)
+    metrics_json_str = generate_text(client, metric_extraction_prompt, full_input, cache=cache, refresh=refresh)
+    with tracing.span("json.parse_metrics", chars=len(metrics_json_str or "")):
+        try:
+            return json.loads(metrics_json_str)
+        except (TypeError, json.JSONDecodeError):
+            tracing.count("llm.unparseable_responses")
+            return None
+
+def metric_extraction_agent(metric_extraction_prompt, startup_information, client, token_budget=DEFAULT_TOKEN_BUDGET,
+                            cache=None, refresh=False):
+    metrics_json_obj = extract_metrics(metric_extraction_prompt, startup_information, client,
+                                       token_budget, cache, refresh)
+    if metrics_json_obj is None:
+        import streamlit as st
         st.warning("Model output could not be parsed as JSON. Showing synthetic data for demo.")
-        metrics_json_obj = None
     return metrics_json_obj
 
-def generate_synthetic_from_llm(llm_metrics):
-    synthetic = {}
-    rng = np.random.default_rng(seed=42)
-    for k, v in llm_metrics.items():
+# Shape of each metric value, decided once and shared by the synthetic data
+# and the chart selection: "scalar", "list" / "dict" of numbers, or "other"
+def classify_metrics(metrics):
+    kinds = {}
+    for k, v in metrics.items():
         if isinstance(v, (int, float)):
-            noise = rng.uniform(0.9, 1.1)
-            synthetic[k] = round(v * noise, 2)
+            kinds[k] = "scalar"
         elif isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
-            synthetic[k] = [round(i * rng.uniform(0.9, 1.1), 2) for i in v]
+            kinds[k] = "list"
         elif isinstance(v, dict) and all(isinstance(val, (int, float)) for val in v.values()):
-            synthetic[k] = {kk: round(val * rng.uniform(0.9, 1.1), 2) for kk, val in v.items()}
+            kinds[k] = "dict"
+        else:
+            kinds[k] = "other"
+    return kinds
+
+def generate_synthetic_from_llm(llm_metrics, kinds=None):
+    import numpy as np
+    kinds = kinds if kinds is not None else classify_metrics(llm_metrics)
+    # All numeric leaves in key order get one noise draw; the generator yields
+    # the same sequence as drawing them one at a time with the same seed
+    leaves = []
+    for k, v in llm_metrics.items():
+        kind = kinds[k]
+        if kind == "scalar":
+            leaves.append(v)
+        elif kind == "list":
+            leaves.extend(v)
+        elif kind == "dict":
+            leaves.extend(v.values())
+    rng = np.random.default_rng(seed=42)
+    noisy = np.round(np.asarray(leaves, dtype=np.float64) * rng.uniform(0.9, 1.1, size=len(leaves)), 2).tolist()
+
+    synthetic = {}
+    offset = 0
+    for k, v in llm_metrics.items():
+        kind = kinds[k]
+        if kind == "scalar":
+            synthetic[k] = noisy[offset]
+            offset += 1
+        elif kind == "list":
+            synthetic[k] = noisy[offset:offset + len(v)]
+            offset += len(v)
+        elif kind == "dict":
+            synthetic[k] = dict(zip(v.keys(), noisy[offset:offset + len(v)]))
+            offset += len(v)
         else:
             synthetic[k] = v
     return synthetic
 
-def display_metrics(metrics, st):
+def display_metrics(metrics, st, startup_label="Nario"):
+    # pandas/plotly are only needed once a chart is actually drawn
+    import pandas as pd
+    import plotly.express as px
     st.markdown("<h2 style='color:#1976d2'>📊 Startup Metrics Analysis</h2>", unsafe_allow_html=True)
 
     # If metrics is None, show synthetic demo data only
     if not metrics:
         st.info("No metrics available from the model. Showing synthetic data for demo.")
-        # Synthetic data: metrics for Nario and Market
+        # Synthetic data: metrics for the startup and Market
         data = {
             "Metric": ["Revenue ($K)", "Active Users", "Growth Rate (%)", "Retention (%)"],
-            "Nario": [120, 1500, 35, 82],
+            startup_label: [120, 1500, 35, 82],
             "Market": [90, 1800, 28, 88]
         }
         df = pd.DataFrame(data)
         # Pie chart data
         pie_data = pd.DataFrame({
-            "Type": ["Nario", "Market"],
+            "Type": [startup_label, "Market"],
             "Users": [1500, 1800]
         })
         # Horizontal bar chart data
         bar_data = pd.DataFrame({
-            "Type": ["Nario", "Market"],
+            "Type": [startup_label, "Market"],
             "Retention": [82, 88]
         })
         # Side by side plotly charts
@@ -92,7 +127,7 @@ def display_metrics(metrics, st):
         months = ["Apr", "May", "Jun", "Jul", "Aug", "Sep"]
         revenue_trend = pd.DataFrame({
             "Month": months,
-            "Nario": [20, 25, 30, 25, 10, 10],
+            startup_label: [20, 25, 30, 25, 10, 10],
             "Market": [15, 20, 20, 18, 8, 9]
         })
         revenue_trend = revenue_trend.set_index("Month")
@@ -101,31 +136,39 @@ def display_metrics(metrics, st):
         st.success("Synthetic metrics visualized for demo!")
         return
 
+    # The metric prompt returns a list of {"metric", "value", ...} records;
+    # those become {period: value} dicts, whose keys are already the labels
+    keyed_by_period = isinstance(metrics, list)
+    if keyed_by_period:
+        from metrics_store import normalize_metrics, to_metrics_dict
+        metrics = to_metrics_dict(normalize_metrics(startup_label, metrics))
+
     # If metrics is a dict, generate synthetic data based on the same keys/structure
-    synthetic_metrics = generate_synthetic_from_llm(metrics)
+    kinds = classify_metrics(metrics)
+    synthetic_metrics = generate_synthetic_from_llm(metrics, kinds)
 
     # --- PIE CHART: Let's try "Active Users" or whatever key fits ---
     pie_llm = None
     pie_syn = None
     pie_key = None
     for k, v in metrics.items():
-        if isinstance(v, dict) and all(isinstance(val, (int, float)) for val in v.values()):
+        if kinds[k] == "dict":
             pie_key = k
-            # Remap keys to 'Nario' and 'Market' if only two items
+            # Remap keys to the startup and 'Market' if only two items (not for periods)
             startups_llm = list(v.keys())
             startups_syn = list(synthetic_metrics[k].keys())
-            if len(startups_llm) == 2:
-                startups_llm = ["Nario", "Market"]
-                startups_syn = ["Nario", "Market"]
+            if len(startups_llm) == 2 and not keyed_by_period:
+                startups_llm = [startup_label, "Market"]
+                startups_syn = [startup_label, "Market"]
             pie_llm = pd.DataFrame({"Type": startups_llm, "Users": list(v.values())})
             pie_syn = pd.DataFrame({"Type": startups_syn, "Users": list(synthetic_metrics[k].values())})
             break
     if pie_llm is None:
         for k, v in metrics.items():
-            if isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
+            if kinds[k] == "list":
                 pie_key = k
-                pie_llm = pd.DataFrame({"Type": ["Nario", "Market"], "Users": v[:2]})
-                pie_syn = pd.DataFrame({"Type": ["Nario", "Market"], "Users": synthetic_metrics[k][:2]})
+                pie_llm = pd.DataFrame({"Type": [startup_label, "Market"], "Users": v[:2]})
+                pie_syn = pd.DataFrame({"Type": [startup_label, "Market"], "Users": synthetic_metrics[k][:2]})
                 break
 
     # --- BAR CHART: Try another key of similar shape ---
@@ -133,22 +176,22 @@ def display_metrics(metrics, st):
     bar_syn = None
     bar_key = None
     for k, v in metrics.items():
-        if k != pie_key and isinstance(v, dict) and all(isinstance(val, (int, float)) for val in v.values()):
+        if k != pie_key and kinds[k] == "dict":
             bar_key = k
             startups_llm = list(v.keys())
             startups_syn = list(synthetic_metrics[k].keys())
-            if len(startups_llm) == 2:
-                startups_llm = ["Nario", "Market"]
-                startups_syn = ["Nario", "Market"]
+            if len(startups_llm) == 2 and not keyed_by_period:
+                startups_llm = [startup_label, "Market"]
+                startups_syn = [startup_label, "Market"]
             bar_llm = pd.DataFrame({"Type": startups_llm, "Value": list(v.values())})
             bar_syn = pd.DataFrame({"Type": startups_syn, "Value": list(synthetic_metrics[k].values())})
             break
     if bar_llm is None:
         for k, v in metrics.items():
-            if k != pie_key and isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
+            if k != pie_key and kinds[k] == "list":
                 bar_key = k
-                bar_llm = pd.DataFrame({"Type": ["Nario", "Market"], "Value": v[:2]})
-                bar_syn = pd.DataFrame({"Type": ["Nario", "Market"], "Value": synthetic_metrics[k][:2]})
+                bar_llm = pd.DataFrame({"Type": [startup_label, "Market"], "Value": v[:2]})
+                bar_syn = pd.DataFrame({"Type": [startup_label, "Market"], "Value": synthetic_metrics[k][:2]})
                 break
 
     # --- SIDE BY SIDE CHARTS ---
@@ -181,7 +224,7 @@ def display_metrics(metrics, st):
 
     # --- LINE CHART: Show LLM vs Synthetic for a list metric if available ---
     for k, v in metrics.items():
-        if isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
+        if kinds[k] == "list":
             st.markdown(f"<h3 style='color:#ff8f00'>Trend Comparison: {k} (LLM vs Synthetic)</h3>", unsafe_allow_html=True)
             trend_df = pd.DataFrame({
                 "Index": list(range(len(v))),
@@ -197,6 +240,9 @@ def display_metrics(metrics, st):
     st.json({"LLM": metrics, "Synthetic": synthetic_metrics})
 
 def metric_generation_agent():
+    import streamlit as st
+    from dotenv import load_dotenv
+    from google import genai
     load_dotenv()
     client = genai.Client()
     current_directory = os.getcwd()
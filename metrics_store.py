@@ -0,0 +1,150 @@
+import os
+import re
+import math
+from typing import Any, Dict, List
+
+import pandas as pd
+
+DEFAULT_METRICS_STORE_PATH = os.path.join("data", "metrics_store.parquet")
+COLUMNS = ["startup", "metric", "value", "unit", "period", "section", "raw_value"]
+
+# Scale words that show up in deck metrics ("₹5 crore", "10 million farmers")
+MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "lakh": 1e5, "lakhs": 1e5, "lac": 1e5,
+    "m": 1e6, "mn": 1e6, "million": 1e6,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+_NUMBER_RE = r"(-?\d[\d,]*\.?\d*)\s*(k|thousand|lakhs?|lac|mn|m|million|crores?|cr|bn|b|billion)?\b"
+_UNIT_IN_NAME_RE = re.compile(r"\(([^)]*)\)\s*$")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value)
+
+
+# Flatten one startup's LLM metrics into rows of the store schema. Accepts the
+# record list the metric prompt asks for ([{"metric", "value", "unit",
+# "time_frame", "section"}]) as well as the dict shape display_metrics uses
+# ({name: number | [numbers] | {label: number}}).
+def normalize_metrics(startup: str, metrics: Any) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+    if isinstance(metrics, list):
+        for record in metrics:
+            if not isinstance(record, dict) or "metric" not in record:
+                continue
+            value = record.get("value", "")
+            rows.append({
+                "metric": str(record["metric"]),
+                "number": value if _is_number(value) else None,
+                "raw_value": str(value),
+                "unit": record.get("unit"),
+                "period": record.get("time_frame"),
+                "section": record.get("section"),
+            })
+    elif isinstance(metrics, dict):
+        for name, value in metrics.items():
+            match = _UNIT_IN_NAME_RE.search(name)
+            unit = match.group(1) if match else None
+            if isinstance(value, list):
+                items = [(str(i), v) for i, v in enumerate(value)]
+            elif isinstance(value, dict):
+                items = [(str(k), v) for k, v in value.items()]
+            else:
+                items = [(None, value)]
+            for period, item in items:
+                rows.append({"metric": name, "number": item if _is_number(item) else None,
+                             "raw_value": str(item), "unit": unit, "period": period, "section": None})
+    frame = pd.DataFrame(rows, columns=["metric", "number", "raw_value", "unit", "period", "section"])
+    frame.insert(0, "startup", startup)
+    # Numbers pass through untouched; strings go through the scale-word parser
+    frame["value"] = pd.to_numeric(frame["number"], errors="coerce").fillna(parse_values(frame["raw_value"]))
+    return frame[COLUMNS].astype({"startup": "string", "metric": "string", "value": "float64", "unit": "string",
+                                  "period": "string", "section": "string", "raw_value": "string"})
+
+
+# Back to the {name: number | {period: number}} shape the charts in
+# display_metrics understand; non-numeric rows are dropped.
+def to_metrics_dict(frame: pd.DataFrame) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    numeric = frame[frame["value"].notna()]
+    for name, group in numeric.groupby("metric", sort=False):
+        if len(group) == 1:
+            metrics[name] = float(group["value"].iloc[0])
+        else:
+            periods = group["period"].fillna("").astype(str)
+            metrics[name] = dict(zip(periods, group["value"].astype(float)))
+    return metrics
+
+
+# Vectorized "number + optional scale word" parse; NaN where nothing numeric
+def parse_values(raw: pd.Series) -> pd.Series:
+    parts = raw.astype("string").str.lower().str.extract(_NUMBER_RE)
+    numbers = pd.to_numeric(parts[0].str.replace(",", "", regex=False), errors="coerce")
+    scale = parts[1].map(MULTIPLIERS).astype("float64").fillna(1.0)
+    return (numbers * scale).astype("float64")
+
+
+# Columnar metrics for the whole portfolio, persisted as Parquet. Views are
+# plain pandas group-bys/pivots over the table, so comparing hundreds of
+# startups costs one vectorized pass and no model calls.
+class MetricsStore:
+    def __init__(self, path: str = DEFAULT_METRICS_STORE_PATH):
+        self.path = path
+        if os.path.exists(path):
+            self.frame = pd.read_parquet(path)
+        else:
+            self.frame = normalize_metrics("", []).iloc[0:0]
+
+    def upsert(self, startup: str, metrics: Any) -> pd.DataFrame:
+        rows = normalize_metrics(startup, metrics)
+        kept = self.frame[self.frame["startup"] != startup]
+        self.frame = pd.concat([kept, rows], ignore_index=True) if len(kept) else rows.reset_index(drop=True)
+        return rows
+
+    def save(self) -> None:
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        self.frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+    def startups(self) -> List[str]:
+        return sorted(self.frame["startup"].dropna().unique().tolist())
+
+    def metrics(self) -> List[str]:
+        return sorted(self.frame["metric"].dropna().unique().tolist())
+
+    def _numeric(self, metric: str = None) -> pd.DataFrame:
+        frame = self.frame[self.frame["value"].notna()]
+        if metric is not None:
+            frame = frame[frame["metric"].str.casefold() == metric.casefold()]
+        return frame
+
+    # One row per startup, one column per period (and unit, so values in
+    # different units are never put side by side), for a single metric
+    def compare(self, metric: str) -> pd.DataFrame:
+        frame = self._numeric(metric)
+        columns = _with_unit(frame["period"].fillna("value"), frame["unit"])
+        return frame.pivot_table(index="startup", columns=columns, values="value", aggfunc="last")
+
+    # Percentile rank (0-1] of each startup's value within its metric/period/unit
+    def percentile_ranks(self, metric: str = None) -> pd.DataFrame:
+        frame = self._numeric(metric).copy()
+        keys = [frame["metric"].str.casefold(), frame["period"].fillna(""), frame["unit"].fillna("").str.casefold()]
+        frame["percentile"] = frame.groupby(keys)["value"].rank(pct=True)
+        return frame[["startup", "metric", "period", "value", "unit", "percentile"]].reset_index(drop=True)
+
+    # Periods as the index, one column per startup (and unit), ready for a line chart
+    def trend(self, metric: str) -> pd.DataFrame:
+        frame = self._numeric(metric)
+        frame = frame[frame["period"].notna()]
+        columns = _with_unit(frame["startup"], frame["unit"])
+        return frame.pivot_table(index="period", columns=columns, values="value", aggfunc="last")
+
+
+# "FY25" -> "FY25 (INR)"; labels without a unit are left as they are
+def _with_unit(labels: pd.Series, units: pd.Series) -> pd.Series:
+    labels = labels.astype("string")
+    return labels.where(units.isna(), labels + " (" + units + ")")
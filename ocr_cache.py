@@ -0,0 +1,26 @@
+import os
+import hashlib
+from typing import Sequence
+
+from file_cache import DEFAULT_CACHE_LOW_WATER, DEFAULT_CACHE_MAX_BYTES, FileCache
+
+DEFAULT_OCR_CACHE_DIR = os.path.join(".cache", "ocr")
+DEFAULT_OCR_CACHE_MAX_BYTES = DEFAULT_CACHE_MAX_BYTES
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+# Persistent OCR results keyed by image content hash + OCR languages + engine
+# version, stored and evicted as described on FileCache.
+class OCRCache(FileCache):
+    def __init__(self, directory: str = DEFAULT_OCR_CACHE_DIR,
+                 max_bytes: int = DEFAULT_OCR_CACHE_MAX_BYTES,
+                 low_water: float = DEFAULT_CACHE_LOW_WATER):
+        super().__init__(directory, max_bytes, low_water)
+
+    @staticmethod
+    def key(digest: str, langs: Sequence[str], engine_version: str) -> str:
+        raw = f"{digest}|{','.join(sorted(langs))}|{engine_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,106 @@
+import io
+import time
+import threading
+from typing import Any, Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# One OCR engine per process and language set; the easyocr model is loaded
+# on first use and reused for every image afterwards.
+class OCREngine:
+    def __init__(self, langs: Sequence[str] = ("en",), gpu: bool = False):
+        self.langs = tuple(langs)
+        self.gpu = gpu
+        self._reader = None
+        self._lock = threading.Lock()
+        self.load_seconds = 0.0
+        self.inference_seconds: List[float] = []
+
+    @property
+    def version(self) -> str:
+        # Read from package metadata so cache keys don't force a torch import
+        from importlib.metadata import PackageNotFoundError, version
+        try:
+            return f"easyocr-{version('easyocr')}"
+        except PackageNotFoundError:
+            return "easyocr-unknown"
+
+    @property
+    def loaded(self) -> bool:
+        return self._reader is not None
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            with self._lock:
+                if self._reader is None:
+                    import easyocr
+                    import tracing
+                    start = time.perf_counter()
+                    with tracing.span("ocr.load_model", langs=list(self.langs), gpu=self.gpu):
+                        self._reader = easyocr.Reader(list(self.langs), gpu=self.gpu)
+                    self.load_seconds = time.perf_counter() - start
+        return self._reader
+
+    @staticmethod
+    def decode(image_bytes: bytes) -> "np.ndarray":
+        from PIL import Image
+        import numpy as np
+        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        return np.asarray(image)
+
+    def readtext_timed(self, images: Sequence[Any]) -> Tuple[List[str], List[float]]:
+        # Accepts raw image bytes or already decoded arrays; returns the joined
+        # text lines and the inference seconds for each image, in input order.
+        # This is one readtext call per image, not a batched forward pass:
+        # easyocr's readtext_batched needs all images resized to one
+        # n_width/n_height, which hurts accuracy on decks mixing small logos
+        # with full-slide charts. The timings belong to this call only, so
+        # callers sharing the engine across threads don't see each other's.
+        reader = self.reader
+        texts = []
+        seconds = []
+        for image in images:
+            if isinstance(image, (bytes, bytearray)):
+                image = self.decode(image)
+            start = time.perf_counter()
+            result = reader.readtext(image)
+            seconds.append(time.perf_counter() - start)
+            texts.append(" ".join([item[1] for item in result]))
+        with self._lock:
+            self.inference_seconds.extend(seconds)
+        return texts, seconds
+
+    def readtext_many(self, images: Sequence[Any]) -> List[str]:
+        return self.readtext_timed(images)[0]
+
+    def readtext(self, image: Any) -> str:
+        return self.readtext_many([image])[0]
+
+    def stats(self, since: int = 0) -> Dict[str, Any]:
+        # `since` is an index into the inference log, so callers can report
+        # only the images they submitted themselves.
+        seconds = self.inference_seconds[since:]
+        return {
+            "langs": list(self.langs),
+            "load_seconds": round(self.load_seconds, 4),
+            "images": len(seconds),
+            "inference_seconds": round(sum(seconds), 4),
+            "per_image_seconds": [round(s, 4) for s in seconds],
+        }
+
+
+_engines: Dict[Tuple[Tuple[str, ...], bool], OCREngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_ocr_engine(langs: Sequence[str] = ("en",), gpu: bool = False) -> OCREngine:
+    key = (tuple(sorted(langs)), gpu)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = OCREngine(key[0], gpu=gpu)
+            _engines[key] = engine
+    return engine
@@ -0,0 +1,137 @@
+import io
+import math
+from typing import Any, Dict, List, Optional
+
+# Below these an image is an icon, bullet or divider rather than readable text
+DEFAULT_MIN_SIDE = 12
+DEFAULT_MIN_PIXELS = 32 * 32
+# Grayscale histogram entropy (bits) under which an image is a flat fill or a
+# near-uniform background
+DEFAULT_MIN_ENTROPY = 0.5
+# A page with at least this much text-layer text is taken to carry its own
+# content, and an image on it that is small both on the page and in pixels
+# (logo, icon, avatar) is not OCRed. A chart placed small on a text-heavy
+# slide still has the resolution to be read, so it is kept.
+DEFAULT_TEXT_LAYER_CHARS = 200
+DEFAULT_LARGE_IMAGE_FRACTION = 0.25
+DEFAULT_COVERED_MAX_PIXELS = 160 * 160
+# Pages with less text than this are raster slides; with several images they
+# are OCRed as one page render whose longer side is at most render_max_side
+DEFAULT_TEXTLESS_CHARS = 20
+DEFAULT_RENDER_MAX_SIDE = 1280
+
+SKIP_REASONS = ("too_small", "low_entropy", "covered_by_text", "in_page_render")
+
+
+# Shannon entropy of a downscaled grayscale copy of the image
+def image_entropy(image_bytes: bytes, sample_side: int = 128) -> float:
+    from PIL import Image
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image.draft("L", (sample_side, sample_side))
+        gray = image.convert("L")
+        gray.thumbnail((sample_side, sample_side))
+        histogram = gray.histogram()
+    total = float(sum(histogram))
+    if not total:
+        return 0.0
+    return -sum(n / total * math.log2(n / total) for n in histogram if n)
+
+
+# Decides, per page, which extracted images are worth sending to the OCR
+# engine and whether a text-less slide is better OCRed as a single render.
+# Plain attributes only, so planners pickle into ProcessPoolExecutor workers.
+class OCRPlanner:
+    def __init__(self, min_side: int = DEFAULT_MIN_SIDE, min_pixels: int = DEFAULT_MIN_PIXELS,
+                 min_entropy: float = DEFAULT_MIN_ENTROPY, text_layer_chars: int = DEFAULT_TEXT_LAYER_CHARS,
+                 large_image_fraction: float = DEFAULT_LARGE_IMAGE_FRACTION,
+                 covered_max_pixels: int = DEFAULT_COVERED_MAX_PIXELS,
+                 textless_chars: int = DEFAULT_TEXTLESS_CHARS, render_max_side: int = DEFAULT_RENDER_MAX_SIDE):
+        self.min_side = min_side
+        self.min_pixels = min_pixels
+        self.min_entropy = min_entropy
+        self.text_layer_chars = text_layer_chars
+        self.large_image_fraction = large_image_fraction
+        self.covered_max_pixels = covered_max_pixels
+        self.textless_chars = textless_chars
+        self.render_max_side = render_max_side
+
+    # Thresholds as a dict, stored with incremental state so a change re-plans
+    def config(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    def _skip_reason(self, img: Dict[str, Any], page_text_chars: int, page_fraction: float) -> Optional[str]:
+        width, height = img.get("width", 0), img.get("height", 0)
+        if min(width, height) < self.min_side or width * height < self.min_pixels:
+            return "too_small"
+        if (page_text_chars >= self.text_layer_chars and page_fraction < self.large_image_fraction
+                and width * height <= self.covered_max_pixels):
+            return "covered_by_text"
+        if image_entropy(img["image_bytes"]) < self.min_entropy:
+            return "low_entropy"
+        return None
+
+    # page_images need "image_bytes", "width" and "height"; page_fractions is
+    # the share of the page each image covers. Returns the page mode
+    # ("none", "images", "render"), the indexes to OCR and a decision per image.
+    def plan_page(self, page_text: str, page_images: List[Dict[str, Any]],
+                  page_fractions: List[float]) -> Dict[str, Any]:
+        text_chars = len("".join(page_text.split()))
+        decisions = []
+        candidates = []
+        for i, img in enumerate(page_images):
+            reason = self._skip_reason(img, text_chars, page_fractions[i])
+            decisions.append(reason or "ocr")
+            if reason is None:
+                candidates.append(i)
+        mode = "images" if candidates else "none"
+        if text_chars < self.textless_chars and len(candidates) > 1:
+            mode = "render"
+            for i in candidates:
+                decisions[i] = "in_page_render"
+            candidates = []
+        return {"mode": mode, "text_chars": text_chars, "ocr": candidates, "decisions": decisions}
+
+    # One downscaled PNG of the whole page, in place of its image fragments
+    def render_page(self, fitz_page) -> bytes:
+        import fitz  # PyMuPDF
+        rect = fitz_page.rect
+        zoom = min(2.0, self.render_max_side / max(rect.width, rect.height, 1))
+        return fitz_page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+
+
+DEFAULT_OCR_PLANNER = OCRPlanner()
+
+
+# Share of the page area covered by each image (largest placement per xref)
+def image_page_fractions(fitz_page, page_images: List[Dict[str, Any]]) -> List[float]:
+    page_area = abs(fitz_page.rect) or 1.0
+    fractions = []
+    for img in page_images:
+        rects = fitz_page.get_image_rects(img["xref"])
+        fractions.append(max((abs(rect) for rect in rects), default=0.0) / page_area)
+    return fractions
+
+
+# Roll the per-page plans up for ocr_stats. Seconds saved is an estimate:
+# images not sent to the engine times the mean per-image OCR time observed
+# in this run.
+def summarize_plans(plans: List[Dict[str, Any]], ocr_seconds: List[float]) -> Dict[str, Any]:
+    modes = {"none": 0, "images": 0, "render": 0}
+    skipped = {reason: 0 for reason in SKIP_REASONS}
+    images = 0
+    for plan in plans:
+        modes[plan["mode"]] += 1
+        images += len(plan["decisions"])
+        for decision in plan["decisions"]:
+            if decision in skipped:
+                skipped[decision] += 1
+    # A render still costs one OCR call per page
+    avoided = sum(skipped.values()) - modes["render"]
+    mean_seconds = sum(ocr_seconds) / len(ocr_seconds) if ocr_seconds else 0.0
+    return {
+        "pages": modes,
+        "images": images,
+        "images_skipped": skipped,
+        "ocr_calls_avoided": avoided,
+        "estimated_seconds_saved": round(max(0, avoided) * mean_seconds, 4),
+    }
@@ -0,0 +1,56 @@
+import time
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import tracing
+
+from deal_notes_generation import generate_deal_notes
+from metric_generation_agent import extract_metrics
+
+
+# Handle for one pipeline run: a future per task plus the wall-clock latency
+# of each call, filled in as the tasks finish.
+class GenerationRun:
+    def __init__(self):
+        self.deal_notes: Optional[Future] = None
+        self.metrics: Optional[Future] = None
+        self.latencies: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _timed(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            with tracing.span(f"pipeline.{name}"):
+                return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.latencies[name] = time.perf_counter() - start
+
+    def wait(self) -> "GenerationRun":
+        self.deal_notes.exception()
+        self.metrics.exception()
+        return self
+
+
+# Deal notes and metric extraction only read startup_information, so both
+# model calls are sent at once and the run takes about as long as the slower
+# one. llm_options (token_budget, cache, refresh) go to both tasks. Without an
+# executor a two-thread pool is created for this run.
+def run_generation_pipeline(deal_notes_prompt: str, metric_extraction_prompt: str,
+                            startup_information: Dict[str, Any], client,
+                            executor: Executor = None, **llm_options) -> GenerationRun:
+    run = GenerationRun()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="generation")
+    try:
+        # Submitted with the caller's context, so both tasks trace into its tracer
+        run.deal_notes = tracing.submit(executor, run._timed, "deal_notes", generate_deal_notes,
+                                        deal_notes_prompt, startup_information, client, **llm_options)
+        run.metrics = tracing.submit(executor, run._timed, "metrics", extract_metrics,
+                                     metric_extraction_prompt, startup_information, client, **llm_options)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+    return run
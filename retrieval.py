@@ -0,0 +1,156 @@
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import tracing
+
+DEFAULT_TOKEN_BUDGET = 4000
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 20
+
+# What each generation task looks for in the extracted data
+DEAL_NOTES_QUERY = (
+    "startup name team founder co-founder experience background education linkedin "
+    "product usp technology differentiation customers market size tam sam som growth trend "
+    "competitors traction revenue users growth retention churn orders distribution "
+    "risks concerns ask funding raise use of funds valuation"
+)
+METRIC_QUERY = (
+    "revenue arr mrr crore lakh inr usd % growth margin gross ebitda users customers orders "
+    "retention churn repeat market size tam sam som funding raise valuation allocation "
+    "distributors partners units cac ltv monthly annual fy"
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def _windows(text: str, size: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, size - overlap)
+    return [" ".join(words[i:i + size]) for i in range(0, max(1, len(words) - overlap), step)]
+
+
+# Split the extracted data (pdf_text, pdf_graphs, web_data) into text chunks.
+# Image metadata, raw SVG markup and stats are left out, and chunks with
+# identical text (e.g. the same logo OCRed on every slide) are kept once.
+def build_chunks(startup_information: Dict[str, Any]) -> List[Dict[str, Any]]:
+    chunks = []
+    seen = set()
+
+    def add(source: str, text: str) -> None:
+        text = " ".join(text.split())
+        if not text:
+            return
+        digest = hashlib.sha1(text.lower().encode("utf-8")).hexdigest()
+        if digest in seen:
+            return
+        seen.add(digest)
+        chunks.append({"id": len(chunks), "source": source, "text": text})
+
+    for window in _windows(startup_information.get("pdf_text", "")):
+        add("pdf_text", window)
+
+    graphs_by_page: Dict[Any, List[str]] = {}
+    for graph in startup_information.get("pdf_graphs", []):
+        graphs_by_page.setdefault(graph.get("page"), []).append(graph.get("desc", ""))
+    for page, descs in graphs_by_page.items():
+        for window in _windows(" ".join(dict.fromkeys(descs))):
+            add(f"pdf_graphs page {page}", window)
+
+    for entry in startup_information.get("web_data", []):
+        url = entry.get("url", "")
+        content = entry.get("content", {})
+        for window in _windows(content.get("website_text", "")):
+            add(f"web_data {url}", window)
+        captions = [img.get("caption", "") for img in content.get("images", []) if img.get("caption")]
+        descs = [graph.get("desc", "") for graph in content.get("graphs", []) if graph.get("desc")]
+        for window in _windows(" ".join(dict.fromkeys(captions + descs))):
+            add(f"web_data {url}", window)
+    return chunks
+
+
+# Okapi BM25 over chunk texts; small enough to build per request.
+class BM25Index:
+    def __init__(self, chunks: List[Dict[str, Any]], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(chunk["text"])) for chunk in chunks]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        doc_freq = Counter()
+        for tf in self.term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(chunks)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def score(self, query_terms: List[str], i: int) -> float:
+        tf = self.term_freqs[i]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1))
+        total = 0.0
+        for term in query_terms:
+            freq = tf.get(term)
+            if freq:
+                total += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+        return total
+
+    def search(self, query: str, k: int = None) -> List[Tuple[float, Dict[str, Any]]]:
+        terms = set(tokenize(query))
+        scored = [(self.score(terms, i), chunk) for i, chunk in enumerate(self.chunks)]
+        scored.sort(key=lambda item: (-item[0], item[1]["id"]))
+        return scored[:k] if k else scored
+
+
+# Take the best-scoring chunks until token_budget is spent, then restore
+# document order so the model reads excerpts in their original sequence.
+def select_chunks(chunks: List[Dict[str, Any]], query: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                  k: int = None) -> List[Dict[str, Any]]:
+    selected = []
+    used = 0
+    for score, chunk in BM25Index(chunks).search(query, k):
+        cost = estimate_tokens(chunk["source"]) + estimate_tokens(chunk["text"])
+        if used + cost > token_budget:
+            continue
+        selected.append(chunk)
+        used += cost
+    return sorted(selected, key=lambda chunk: chunk["id"])
+
+
+# Build the model input for a prompt. With token_budget=None the whole
+# extracted data is embedded as before; otherwise only the top-ranked chunks
+# for the task query, compactly serialized, within the budget.
+def build_llm_input(prompt: str, data_label: str, startup_information: Dict[str, Any], query: str,
+                    token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    with tracing.span("llm.build_input", data_label=data_label, token_budget=token_budget) as input_span:
+        if token_budget is None:
+            full_input = (
+                f"{prompt}\n\n"
+                f"Here is the {data_label} in JSON format:\n"
+                f"{json.dumps(startup_information, indent=2)}"
+            )
+        else:
+            excerpts = [{"source": chunk["source"], "text": chunk["text"]}
+                        for chunk in select_chunks(build_chunks(startup_information), query, token_budget)]
+            input_span.set(chunks=len(excerpts))
+            full_input = (
+                f"{prompt}\n\n"
+                f"Here are the most relevant excerpts of the {data_label} in JSON format "
+                "(each with the field it came from):\n"
+                f"{json.dumps(excerpts, ensure_ascii=False, separators=(',', ':'))}"
+            )
+        input_span.set(chars=len(full_input))
+    return full_input
@@ -1,55 +1,244 @@
 import streamlit as st
 from deal_notes_generation import (
-    read_docx, save_to_docx, read_data, display_deal_notes, generate_deal_notes
+    docx_bytes, read_data, display_deal_notes, display_deal_notes_stream, generate_deal_notes_stream
 )
 from metric_generation_agent import (
-    metric_extraction_agent, display_metrics
+    extract_metrics, display_metrics
 )
+from llm_cache import LLMCache
+from pipeline import run_generation_pipeline
+import tracing
 import os
-from dotenv import load_dotenv
-from google import genai
+import threading
 
-def main():
+TRACE_PATH = os.path.join(".cache", "traces", "dashboard.json")
+
+# Heavy objects live for the whole server process; file contents are cached
+# per (path, mtime), so editing a prompt or re-ingesting a deck invalidates them.
+@st.cache_resource
+def get_llm_scheduler():
+    from llm_scheduler import LLMScheduler
+    return LLMScheduler.from_env()
+
+# Dashboard requests go through the shared scheduler ahead of batch work
+@st.cache_resource
+def get_client():
+    from dotenv import load_dotenv
+    from google import genai
+    from llm_scheduler import INTERACTIVE
     load_dotenv()
-    client = genai.Client()
+    return get_llm_scheduler().client(genai.Client(), priority=INTERACTIVE)
+
+# Portfolio re-runs share the same scheduler but queue behind dashboard requests
+@st.cache_resource
+def get_batch_client():
+    from llm_scheduler import BATCH
+    return get_llm_scheduler().client(get_client().wrapped, priority=BATCH)
+
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+# Only the current version of each file is kept: the two prompts, the one
+# extracted data file
+@st.cache_data(max_entries=2)
+def load_prompt(path, mtime):
+    with open(path, "r", encoding='utf-8') as file:
+        return file.read()
+
+@st.cache_data(max_entries=1)
+def load_extracted_data(path, mtime):
+    return read_data(path)
+
+# Read-only snapshot per file version; only the latest is kept, since every
+# save changes the mtime and would otherwise leave the old frame cached
+@st.cache_resource(max_entries=1)
+def load_metrics_store(path, mtime):
+    from metrics_store import MetricsStore
+    return MetricsStore(path)
+
+@st.cache_resource
+def metrics_store_lock():
+    return threading.Lock()
+
+def metrics_store():
+    # metrics_store pulls in pandas, so it is imported on first use
+    from metrics_store import DEFAULT_METRICS_STORE_PATH as path
+    return load_metrics_store(path, file_mtime(path) if os.path.exists(path) else None)
+
+# Newly extracted metrics join the portfolio table the comparison views read.
+# Writes go through a fresh store, one session at a time, so the cached
+# snapshot other sessions are reading is never mutated. Without a startup
+# name there is nothing to compare against, so nothing is stored.
+def record_metrics(startup, metrics):
+    if metrics and startup:
+        from metrics_store import DEFAULT_METRICS_STORE_PATH, MetricsStore
+        with metrics_store_lock():
+            store = MetricsStore(DEFAULT_METRICS_STORE_PATH)
+            store.upsert(startup, metrics)
+            store.save()
+
+@st.cache_data
+def notes_docx(text):
+    return docx_bytes(text)
+
+def file_mtime(path):
+    return os.stat(path).st_mtime
+
+def show_deal_notes(summary):
+    if summary is None:
+        st.warning("No deal notes could be generated. Please check your prompt or model response.")
+    else:
+        display_deal_notes(summary, st)
+
+def show_metrics(metrics, startup):
+    if metrics is None:
+        st.warning("Model output could not be parsed as JSON. Showing synthetic data for demo.")
+    display_metrics(metrics, st, startup_label=startup)
+
+# Deal notes and metrics for every startup batch_ingest.py has written out
+def regenerate_portfolio(output_dir, refresh):
+    from batch_generate import generate_portfolio, list_ingested, load_prompts
+    paths = list_ingested(output_dir)
+    if not paths:
+        st.info(f"No ingested startups in {output_dir}. Run batch_ingest.py first.")
+        return
+    progress = st.progress(0.0, text=f"0 of {len(paths)} startups")
+    done = []
+
+    def on_done(summary):
+        done.append(summary)
+        progress.progress(len(done) / len(paths), text=f"{len(done)} of {len(paths)} startups")
+
+    summaries = generate_portfolio(paths, load_prompts(), get_batch_client(), output_dir, record_metrics,
+                                   on_done=on_done, cache=get_llm_cache(), refresh=refresh)
+    for summary in summaries:
+        if "error" in summary:
+            st.warning(f"{summary['startup']}: {summary['error']}")
+
+def show_portfolio(refresh=False):
+    output_dir = os.path.join("data", "output")
+    if st.button("Regenerate all ingested startups", key="portfolio_btn"):
+        regenerate_portfolio(output_dir, refresh)
+    store = metrics_store()
+    if not store.startups():
+        st.info("No stored metrics yet. Generate metrics for a startup to start the portfolio view.")
+        return
+    st.caption(f"{len(store.startups())} startups · {len(store.frame)} metric values")
+    metric = st.selectbox("Metric", store.metrics(), key="portfolio_metric")
+    comparison = store.compare(metric)
+    if comparison.empty:
+        st.info("No numeric values stored for this metric.")
+        return
+    st.markdown("<h3 style='color:#388e3c'>Comparison Across Startups</h3>", unsafe_allow_html=True)
+    st.bar_chart(comparison)
+    st.markdown("<h3 style='color:#1976d2'>Percentile Rank</h3>", unsafe_allow_html=True)
+    st.dataframe(store.percentile_ranks(metric), use_container_width=True)
+    trend = store.trend(metric)
+    if len(trend) > 1:
+        st.markdown("<h3 style='color:#ff8f00'>Trend</h3>", unsafe_allow_html=True)
+        st.line_chart(trend)
+
+# Per-stage timings and counters of the work done in this rerun
+def show_timing_panel(tracer):
+    st.sidebar.markdown("<h3 style='color:#1976d2'>Timing</h3>", unsafe_allow_html=True)
+    st.sidebar.caption("Model request queue")
+    st.sidebar.json(get_llm_scheduler().stats(), expanded=False)
+    summary = tracer.summary()
+    if not summary:
+        st.sidebar.caption("Nothing was traced in this run.")
+        return
+    st.sidebar.dataframe(summary, use_container_width=True)
+    st.sidebar.json(tracer.counters)
+    st.sidebar.caption(f"Trace written to {tracer.export(TRACE_PATH)}")
+
+def show_dashboard():
+    client = get_client()
+    llm_cache = get_llm_cache()
     current_directory = os.getcwd()
     prompts_path = os.path.join(current_directory, "config/prompt")
     deal_notes_prompt_path = os.path.join(prompts_path, "deal_notes_generation.md")
     metric_prompt_path = os.path.join(prompts_path, "metric_generation.md")
     file_path = "all_extracted_data.json"
-    docx_path = "deal_notes_generation.docx"
 
-    with open(deal_notes_prompt_path, "r", encoding='utf-8') as file:
-        deal_notes_prompt = file.read()
-    with open(metric_prompt_path, "r", encoding='utf-8') as file:
-        metric_extraction_prompt = file.read()
-    startup_information = read_data(file_path)
+    inputs_version = tuple(file_mtime(path) for path in (deal_notes_prompt_path, metric_prompt_path, file_path))
+    deal_notes_prompt = load_prompt(deal_notes_prompt_path, inputs_version[0])
+    metric_extraction_prompt = load_prompt(metric_prompt_path, inputs_version[1])
+    startup_information = load_extracted_data(file_path, inputs_version[2])
+
+    # Generated results survive reruns (tab switches, downloads) until an input changes
+    state = st.session_state
+    if state.get("inputs_version") != inputs_version:
+        state["inputs_version"] = inputs_version
+        state["deal_notes"] = None
+        state["metrics"] = None
+        state["metrics_ready"] = False
+        state["timings"] = {}
 
     st.markdown("<h1 style='color:#d32f2f;'>🚀 Startup Deal Notes & Metrics Dashboard</h1>", unsafe_allow_html=True)
     st.markdown("<span style='color:#388e3c'>Generate and review your deal notes and metrics with colorful, sectioned analysis and interactive graphs.</span>", unsafe_allow_html=True)
 
-    tab1, tab2 = st.tabs(["Deal Notes", "Metrics"])
+    startup = st.text_input("Startup name", value=startup_information.get("startup") or "",
+                            placeholder="Name the startup to add its metrics to the portfolio").strip()
+    refresh = st.checkbox("Refresh results (bypass the response cache)", value=False)
+
+    # Both tasks at once: the dashboard waits for the slower call, not the sum
+    if st.button("Generate Deal Notes and Metrics", key="pipeline_btn"):
+        run = run_generation_pipeline(deal_notes_prompt, metric_extraction_prompt, startup_information, client,
+                                      cache=llm_cache, refresh=refresh).wait()
+        state["deal_notes"] = run.deal_notes.result()
+        state["metrics"] = run.metrics.result()
+        state["metrics_ready"] = True
+        record_metrics(startup, state["metrics"])
+        state["timings"] = dict(run.latencies)
+    if state["timings"]:
+        st.caption(" · ".join(f"{name}: {seconds:.1f}s" for name, seconds in state["timings"].items()))
+
+    tab1, tab2, tab3 = st.tabs(["Deal Notes", "Metrics", "Portfolio"])
 
     with tab1:
         st.subheader("Deal Notes Generation and Review")
         if st.button("Generate and Show Deal Notes", key="deal_notes_btn"):
-            summary = generate_deal_notes(deal_notes_prompt, startup_information, client)
-            if summary is None:
-                st.warning("No deal notes could be generated. Please check your prompt or model response.")
-            else:
-                save_to_docx(summary, docx_path)
-                notes = read_docx(docx_path)
-                display_deal_notes(notes, st)
-
-        if os.path.exists(docx_path):
-            with open(docx_path, "rb") as f:
-                st.download_button("Download Deal Notes DOCX", f, file_name="deal_notes_generation.docx")
+            # Sections render as they stream in; the download is built from the same text
+            fragments = generate_deal_notes_stream(deal_notes_prompt, startup_information, client,
+                                                   cache=llm_cache, refresh=refresh)
+            streamed = display_deal_notes_stream(fragments, st)
+            state["deal_notes"] = streamed["text"]
+            if streamed["text"] is not None:
+                st.caption(f"First section after {streamed['time_to_first_section']:.1f}s, "
+                           f"complete after {streamed['total_seconds']:.1f}s")
+        elif state["deal_notes"] is not None:
+            show_deal_notes(state["deal_notes"])
+
+        if state["deal_notes"] is not None:
+            st.download_button("Download Deal Notes DOCX", notes_docx(state["deal_notes"]),
+                               file_name="deal_notes_generation.docx")
 
     with tab2:
         st.subheader("Metric Extraction and Visualization")
         if st.button("Generate and Show Metrics", key="metrics_btn"):
-            metrics = metric_extraction_agent(metric_extraction_prompt, startup_information, client)
-            display_metrics(metrics,st)
+            state["metrics"] = extract_metrics(metric_extraction_prompt, startup_information, client,
+                                               cache=llm_cache, refresh=refresh)
+            state["metrics_ready"] = True
+            record_metrics(startup, state["metrics"])
+        if state["metrics_ready"]:
+            if not startup:
+                st.caption("Enter a startup name to add these metrics to the portfolio.")
+            show_metrics(state["metrics"], startup or "Current startup")
+
+    with tab3:
+        st.subheader("Portfolio Metrics Comparison")
+        show_portfolio(refresh)
+
+def main():
+    # Tracing stays a no-op unless the panel is switched on. The tracer is
+    # active for this session's rerun only (and the pipeline threads it
+    # starts), so concurrent sessions never record into each other's panel.
+    tracer = tracing.Tracer() if st.sidebar.checkbox("Show timing panel", value=False) else None
+    with tracing.activate(tracer):
+        show_dashboard()
+    if tracer is not None:
+        show_timing_panel(tracer)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
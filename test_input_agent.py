@@ -1,16 +1,21 @@
 import os
-import io
 import re
-import requests
-from PIL import Image
-import easyocr
-from bs4 import BeautifulSoup
-from PyPDF2 import PdfReader
-import fitz  # PyMuPDF
-from urllib.parse import urlparse
-from typing import List, Dict, Any, Tuple
+from urllib.parse import urljoin
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
+from concurrent.futures import Executor, ProcessPoolExecutor
 import json
+import hashlib
+from ocr_engine import get_ocr_engine
+from ocr_cache import OCRCache, image_digest
+from ocr_planner import OCRPlanner, DEFAULT_OCR_PLANNER, image_page_fractions, summarize_plans
+import tracing
 import ssl
+
+# PDF, HTML, DOCX and HTTP libraries are imported inside the functions that
+# use them, so importing this module (e.g. for the batch CLI) stays cheap.
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
+    from web_fetcher import WebFetcher
 ssl._create_default_https_context = ssl._create_unverified_context
 
 # Helper for text cleaning
@@ -20,107 +25,515 @@ def clean_text(text: str) -> str:
     text = text.strip()
     return text
 
-# Use EasyOCR for OCR on images
+# Use EasyOCR for OCR on images (the reader is shared per process and language)
 def extract_text_with_easyocr(image_bytes, lang='en'):
-    image_stream = io.BytesIO(image_bytes)
-    image = Image.open(image_stream)
-    reader = easyocr.Reader([lang], gpu=False)
-    result = reader.readtext(image)
-    # Join detected text lines
-    return " ".join([item[1] for item in result])
-
-# Extract text, images & links from PDF
-def extract_pdf_content(pdf_path: str) -> Dict[str, Any]:
-    reader = PdfReader(pdf_path)
-    doc = fitz.open(pdf_path)
+    with tracing.span("ocr.extract_text_with_easyocr", bytes=len(image_bytes)):
+        text = get_ocr_engine([lang]).readtext(image_bytes)
+    tracing.count("ocr.images")
+    tracing.count("ocr.chars", len(text))
+    return text
+
+PDF_BACKENDS = ("pypdf2", "pymupdf")
+
+# Text and /Annots URIs through PyPDF2 (second parse of the file)
+def _pypdf2_text_and_links(reader: "PdfReader", page_idx: int) -> Tuple[str, List[str]]:
+    page = reader.pages[page_idx]
+    page_text = page.extract_text() or ""
+    page_links = []
+    if "/Annots" in page:
+        annots = page["/Annots"]
+        for annot in annots:
+            uri = annot.get_object()
+            if "/A" in uri and "/URI" in uri["/A"]:
+                page_links.append(uri["/A"]["/URI"])
+    return page_text, page_links
+
+# Text and link annotations from the already open fitz page
+def _pymupdf_text_and_links(page) -> Tuple[str, List[str]]:
+    page_text = page.get_text() or ""
+    page_links = [link["uri"] for link in page.get_links() if link.get("uri")]
+    return page_text, page_links
+
+# OCR one page's images, reusing text for xrefs/contents already seen in this
+# range (known_texts) and consulting the persistent cache before the engine.
+def _ocr_page_images(page_images: List[Dict[str, Any]], engine, ocr_cache: OCRCache,
+                     known_texts: Dict[Tuple[str, Any], str],
+                     cache_counts: Dict[str, int]) -> Tuple[List[str], List[float]]:
+    ocr_texts = [None] * len(page_images)
+    pending = {}  # content digest -> (cache key, indexes into page_images)
+    for i, img in enumerate(page_images):
+        digest = image_digest(img["image_bytes"])
+        known = [known_texts[k] for k in (("xref", img["xref"]), ("digest", digest)) if k in known_texts]
+        if known:
+            cache_counts["deduped"] += 1
+            tracing.count("ocr.deduped")
+            ocr_texts[i] = known[0]
+            continue
+        if digest in pending:
+            cache_counts["deduped"] += 1
+            tracing.count("ocr.deduped")
+            pending[digest][1].append(i)
+            continue
+        cache_key = None
+        if ocr_cache is not None:
+            cache_key = OCRCache.key(digest, engine.langs, engine.version)
+            cached = ocr_cache.get(cache_key)
+            if cached is not None:
+                cache_counts["hits"] += 1
+                tracing.count("ocr.cache_hits")
+                ocr_texts[i] = cached
+                known_texts[("xref", img["xref"])] = known_texts[("digest", digest)] = cached
+                continue
+            cache_counts["misses"] += 1
+            tracing.count("ocr.cache_misses")
+        pending[digest] = (cache_key, [i])
+    ocr_seconds = []
+    if pending:
+        with tracing.span("ocr.readtext_many", images=len(pending)):
+            batch, ocr_seconds = engine.readtext_timed([page_images[idxs[0]]["image_bytes"]
+                                                        for _, idxs in pending.values()])
+        tracing.count("ocr.images", len(batch))
+        tracing.count("ocr.chars", sum(len(text) for text in batch))
+        for (digest, (cache_key, idxs)), text in zip(pending.items(), batch):
+            for i in idxs:
+                ocr_texts[i] = text
+                known_texts[("xref", page_images[i]["xref"])] = text
+            known_texts[("digest", digest)] = text
+            if cache_key is not None:
+                ocr_cache.put(cache_key, text)
+    return ocr_texts, ocr_seconds
+
+# Extract text, links, images and OCR for pages [start, stop) of a PDF.
+# Returns one record per page so ranges can be processed anywhere and merged.
+# backend="pypdf2" reads text/links with PyPDF2 and images with fitz;
+# backend="pymupdf" gets everything from a single fitz pass.
+# Identical images (same xref or same bytes) are OCRed once per range, and
+# ocr_cache, when given, lets re-ingested decks skip OCR entirely.
+# ocr_planner picks which images reach the engine; None OCRs every image.
+# OCR happens here, so image bytes are only kept (and shipped back from
+# worker processes) when keep_image_bytes is set.
+def extract_page_range(pdf_path: str, start: int, stop: int, lang: str = 'en',
+                       backend: str = "pypdf2", ocr: bool = True,
+                       ocr_cache: OCRCache = None,
+                       ocr_planner: OCRPlanner = DEFAULT_OCR_PLANNER,
+                       keep_image_bytes: bool = False) -> Dict[str, Any]:
+    stats = {}
+    pages = list(iter_pdf_pages(pdf_path, start, stop, lang, backend, ocr, ocr_cache,
+                                keep_image_bytes=keep_image_bytes, stats=stats, ocr_planner=ocr_planner))
+    return {
+        "pages": pages,
+        "ocr_load_seconds": stats["ocr_load_seconds"],
+        "ocr_cache": stats["ocr_cache"]
+    }
+
+# Generator behind extract_page_range: yields one page record at a time, so
+# only the current page's images are ever held in memory. Unless
+# keep_image_bytes is set, image buffers are dropped as soon as the page is
+# OCRed and the yielded images carry metadata only. OCR load time and cache
+# counters are accumulated into `stats` when given.
+def iter_pdf_pages(pdf_path: str, start: int = 0, stop: int = None, lang: str = 'en',
+                   backend: str = "pypdf2", ocr: bool = True, ocr_cache: OCRCache = None,
+                   keep_image_bytes: bool = False, stats: Dict[str, Any] = None,
+                   ocr_planner: OCRPlanner = DEFAULT_OCR_PLANNER):
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {PDF_BACKENDS}")
+    import fitz  # PyMuPDF
+    from PyPDF2 import PdfReader
+    stats = stats if stats is not None else {}
+    stats.setdefault("ocr_load_seconds", 0.0)
+    cache_counts = stats.setdefault("ocr_cache", {"hits": 0, "misses": 0, "deduped": 0})
+    reader = PdfReader(pdf_path) if backend == "pypdf2" else None
+    engine = get_ocr_engine([lang])
+    was_loaded = engine.loaded
+    known_texts = {}  # xref or content digest -> OCR text
+    with fitz.open(pdf_path) as doc:
+        stop = len(doc) if stop is None else stop
+        for page_idx in range(start, stop):
+            # The span covers extraction only, not the consumer of the yielded record
+            page_span = tracing.span("pdf.page", page=page_idx, backend=backend)
+            with page_span:
+                fitz_page = doc[page_idx]
+                # Extract text and links
+                if reader is not None:
+                    page_text, page_links = _pypdf2_text_and_links(reader, page_idx)
+                else:
+                    page_text, page_links = _pymupdf_text_and_links(fitz_page)
+                # Extract images using fitz (PyMuPDF)
+                page_images = []
+                for img_idx, img in enumerate(fitz_page.get_images(full=True)):
+                    xref = img[0]
+                    base_image = doc.extract_image(xref)
+                    page_images.append({
+                        "page": page_idx,
+                        "img_idx": img_idx,
+                        "xref": xref,
+                        "image_bytes": base_image["image"],
+                        "ext": base_image["ext"],
+                        "width": base_image["width"],
+                        "height": base_image["height"]
+                    })
+                # OCR on the page's images (could be graph, figure, etc.) in one batch
+                graphs = []
+                ocr_seconds = []
+                plan = None
+                if page_images and ocr:
+                    targets = page_images
+                    if ocr_planner is not None:
+                        plan = ocr_planner.plan_page(page_text, page_images,
+                                                     image_page_fractions(fitz_page, page_images))
+                        for img, decision in zip(page_images, plan["decisions"]):
+                            img["ocr_decision"] = decision
+                        if plan["mode"] == "render":
+                            # One render of a raster slide instead of its fragments
+                            targets = [{"page": page_idx, "xref": ("render", page_idx),
+                                        "image_bytes": ocr_planner.render_page(fitz_page)}]
+                        else:
+                            targets = [page_images[i] for i in plan["ocr"]]
+                    ocr_texts = []
+                    if targets:
+                        ocr_texts, ocr_seconds = _ocr_page_images(targets, engine, ocr_cache, known_texts,
+                                                                  cache_counts)
+                    for ocr_text in ocr_texts:
+                        if ocr_text.strip():
+                            graphs.append({"page": page_idx, "desc": clean_text(ocr_text)})
+                    if engine.loaded and not was_loaded:
+                        stats["ocr_load_seconds"] += engine.load_seconds
+                        was_loaded = True
+                page_span.set(images=len(page_images), text_chars=len(page_text))
+            tracing.count("pdf.pages")
+            tracing.count("pdf.images", len(page_images))
+            if not keep_image_bytes:
+                for img in page_images:
+                    del img["image_bytes"]
+            yield {
+                "page": page_idx,
+                "text": page_text,
+                "links": page_links,
+                "images": page_images,
+                "graphs": graphs,
+                "ocr_seconds": ocr_seconds,
+                "ocr_plan": None if plan is None else {key: plan[key] for key in ("mode", "text_chars", "decisions")}
+            }
+
+# Stream a deck to JSON Lines, one page record per line, writing each page as
+# soon as it is extracted instead of building the whole result in memory.
+# Returns the page count and OCR counters.
+def stream_pdf_to_jsonl(pdf_path: str, output_path: str, **options) -> Dict[str, Any]:
+    stats = {}
+    pages = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for record in iter_pdf_pages(pdf_path, stats=stats, **options):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            pages += 1
+    stats["pages"] = pages
+    return stats
+
+# Split [0, page_count) into contiguous ranges of at most pages_per_task pages
+def page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    pages_per_task = max(1, pages_per_task)
+    return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+# Merge page records (in page order) into the extract_pdf_content result
+def merge_page_records(pages: List[Dict[str, Any]], lang: str = 'en', ocr_load_seconds: float = 0.0,
+                       ocr_cache: Dict[str, int] = None) -> Dict[str, Any]:
     all_text = ""
     images = []
     page_links = []
     graphs = []  # Placeholder for possible graph detection (needs ML for advanced detection)
-    for i, page in enumerate(reader.pages):
-        # Extract text
-        page_text = page.extract_text() or ""
-        all_text += page_text + "\n"
-        # Extract links
-        if "/Annots" in page:
-            annots = page["/Annots"]
-            for annot in annots:
-                uri = annot.get_object()
-                if "/A" in uri and "/URI" in uri["/A"]:
-                    page_links.append(uri["/A"]["/URI"])
-    # Extract images using fitz (PyMuPDF)
-    for page_idx in range(len(doc)):
-        page = doc[page_idx]
-        image_list = page.get_images(full=True)
-        for img_idx, img in enumerate(image_list):
-            xref = img[0]
-            base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
-            image_ext = base_image["ext"]
-            images.append({
-                "page": page_idx,
-                "img_idx": img_idx,
-                "image_bytes": image_bytes,
-                "ext": image_ext
-            })
-            # OCR on image (could be graph, figure, etc.) using EasyOCR
-            ocr_text = extract_text_with_easyocr(image_bytes)
-            if ocr_text.strip():
-                graphs.append({"page": page_idx, "desc": clean_text(ocr_text)})
+    ocr_seconds = []
+    for page in pages:
+        all_text += page["text"] + "\n"
+        page_links.extend(page["links"])
+        images.extend(page["images"])
+        graphs.extend(page["graphs"])
+        ocr_seconds.extend(page["ocr_seconds"])
     return {
         "text": clean_text(all_text),
         "images": images,
-        "links": list(set(page_links)),
-        "graphs": graphs
+        "links": list(dict.fromkeys(page_links)),
+        "graphs": graphs,
+        "ocr_stats": {
+            "langs": [lang],
+            "load_seconds": round(ocr_load_seconds, 4),
+            "images": len(ocr_seconds),
+            "inference_seconds": round(sum(ocr_seconds), 4),
+            "per_image_seconds": [round(sec, 4) for sec in ocr_seconds],
+            "cache": ocr_cache or {"hits": 0, "misses": 0, "deduped": 0},
+            "plan": summarize_plans([page["ocr_plan"] for page in pages if page.get("ocr_plan")], ocr_seconds)
+        }
     }
 
-# Download and extract web content (text, images, graphs, captions)
-def extract_website_content(url: str) -> Dict[str, Any]:
+# Run extract_page_range over [start, stop) ranges and return the results in
+# range order. With max_workers > 1 (or an executor) the ranges run in a
+# ProcessPoolExecutor, where each worker keeps its own OCR engine.
+def _extract_ranges(pdf_path: str, ranges: List[Tuple[int, int]], range_args: Tuple,
+                    max_workers: int = None, executor: Executor = None) -> List[Dict[str, Any]]:
+    if executor is None and (max_workers or 1) <= 1:
+        return [extract_page_range(pdf_path, start, stop, *range_args) for start, stop in ranges]
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
     try:
-        resp = requests.get(url, timeout=10)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        # Extract main text
-        paragraphs = soup.find_all("p")
-        website_text = clean_text(" ".join([p.get_text() for p in paragraphs]))
-        # Extract images and attempt to get captions
-        images = []
-        for img in soup.find_all("img"):
-            img_url = img.get("src")
-            if not img_url:
-                continue
-            # Handle relative URLs
-            img_url = requests.compat.urljoin(url, img_url)
-            alt = img.get("alt", "")
-            caption = ""
-            # Try to find figcaption or nearby text
-            parent = img.find_parent("figure")
-            if parent:
-                figcaption = parent.find("figcaption")
-                if figcaption:
-                    caption = figcaption.get_text().strip()
-            if not caption and alt:
-                caption = alt
-            images.append({"img_url": img_url, "caption": caption})
-        # Try to extract SVGs (graphs)
-        graphs = []
-        for svg in soup.find_all("svg"):
-            desc = svg.get("aria-label") or svg.get("title") or svg.get_text()
-            graphs.append({"svg": str(svg), "desc": clean_text(desc)})
-        return {
-            "website_text": website_text,
-            "images": images,
-            "graphs": graphs
-        }
-    except Exception as e:
-        return {"website_text": "", "images": [], "graphs": [], "error": str(e)}
+        futures = [executor.submit(extract_page_range, pdf_path, start, stop, *range_args)
+                   for start, stop in ranges]
+        return [future.result() for future in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+# Pages per task when page_count pages are spread over the workers: about two
+# tasks per worker. A caller-supplied executor should come with its
+# max_workers (CPU count otherwise).
+def _pages_per_task(page_count: int, max_workers: int = None) -> int:
+    workers = max_workers or os.cpu_count() or 1
+    return -(-page_count // (workers * 2)) if page_count else 1
 
-# Main orchestrator
-def extract_all_content_from_pdf(pdf_path: str) -> Dict[str, Any]:
-    pdf_data = extract_pdf_content(pdf_path)
+# Extract text, images & links from PDF.
+# With max_workers > 1 (or an executor) the deck is split into page ranges that
+# run in parallel (see _extract_ranges). Results are merged in page order, so
+# the output is identical to the serial run.
+@tracing.traced("pdf.extract_pdf_content")
+def extract_pdf_content(pdf_path: str, lang: str = 'en', max_workers: int = None,
+                        executor: Executor = None, pages_per_task: int = None,
+                        backend: str = "pypdf2", ocr: bool = True,
+                        ocr_cache: OCRCache = None,
+                        ocr_planner: OCRPlanner = DEFAULT_OCR_PLANNER,
+                        keep_image_bytes: bool = False) -> Dict[str, Any]:
+    import fitz  # PyMuPDF
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+    ranges = [(0, page_count)]
+    if executor is not None or (max_workers or 1) > 1:
+        ranges = page_ranges(page_count, pages_per_task or _pages_per_task(page_count, max_workers))
+    results = _extract_ranges(pdf_path, ranges, (lang, backend, ocr, ocr_cache, ocr_planner, keep_image_bytes),
+                              max_workers, executor)
+    pages = [page for result in results for page in result["pages"]]
+    ocr_load_seconds = sum(result["ocr_load_seconds"] for result in results)
+    cache_counts = {name: sum(result["ocr_cache"][name] for result in results)
+                    for name in ("hits", "misses", "deduped")}
+    return merge_page_records(pages, lang, ocr_load_seconds, cache_counts)
+
+# Fingerprint each page from its content stream, the raw bytes of the images
+# it draws and its link targets; equal fingerprints mean equal extraction.
+def page_fingerprints(pdf_path: str) -> List[str]:
+    import fitz  # PyMuPDF
+    fingerprints = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            digest = hashlib.sha256(page.read_contents())
+            for img in page.get_images(full=True):
+                digest.update(hashlib.sha256(doc.xref_stream_raw(img[0]) or b"").digest())
+            for link in page.get_links():
+                digest.update(str(link.get("uri", "")).encode("utf-8"))
+            fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+# Sidecar file holding the page fingerprints and per-page records of an output
+def page_state_path(output_path: str) -> str:
+    root, _ = os.path.splitext(output_path)
+    return root + ".pages.json"
+
+def _renumber_page(record: Dict[str, Any], page_idx: int) -> Dict[str, Any]:
+    record["page"] = page_idx
+    for item in record["images"] + record["graphs"]:
+        item["page"] = page_idx
+    record["ocr_seconds"] = []  # nothing was OCRed for a reused page
+    return record
+
+# Re-extract only the pages whose fingerprint is not in the previous state
+# (state_path, written by the last run) and splice the stored records in for
+# the rest, so a revised deck costs only its new slides. Reused pages carry
+# image metadata without image_bytes. The result gains a page_diff summary.
+# max_workers, executor and pages_per_task parallelise the changed pages as
+# in extract_pdf_content.
+@tracing.traced("pdf.extract_pdf_content_incremental")
+def extract_pdf_content_incremental(pdf_path: str, state_path: str, lang: str = 'en',
+                                    max_workers: int = None, executor: Executor = None,
+                                    pages_per_task: int = None,
+                                    backend: str = "pypdf2", ocr: bool = True,
+                                    ocr_cache: OCRCache = None,
+                                    ocr_planner: OCRPlanner = DEFAULT_OCR_PLANNER,
+                                    keep_image_bytes: bool = False) -> Dict[str, Any]:
+    fingerprints = page_fingerprints(pdf_path)
+    previous = {}
+    previous_pages = []
+    planner_config = ocr_planner.config() if ocr_planner is not None else None
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if (state.get("lang") == lang and state.get("backend") == backend and state.get("ocr") == ocr
+                and state.get("ocr_planner") == planner_config):
+            previous_pages = state["pages"]
+            for old_idx, entry in enumerate(previous_pages):
+                previous.setdefault(entry["fingerprint"], (old_idx, entry["record"]))
+
+    changed = [i for i, fp in enumerate(fingerprints) if fp not in previous]
+    fresh = {}
+    ocr_load_seconds = 0.0
+    cache_counts = {"hits": 0, "misses": 0, "deduped": 0}
+    # Extract contiguous runs of changed pages together
+    runs = []
+    for page_idx in changed:
+        if runs and runs[-1][1] == page_idx:
+            runs[-1][1] = page_idx + 1
+        else:
+            runs.append([page_idx, page_idx + 1])
+    ranges = [tuple(run) for run in runs]
+    if executor is not None or (max_workers or 1) > 1:
+        # Long runs are split up so the workers share them
+        size = pages_per_task or _pages_per_task(len(changed), max_workers)
+        ranges = [(start + lo, start + hi) for start, stop in runs for lo, hi in page_ranges(stop - start, size)]
+    results = _extract_ranges(pdf_path, ranges, (lang, backend, ocr, ocr_cache, ocr_planner, keep_image_bytes),
+                              max_workers, executor)
+    for result in results:
+        ocr_load_seconds += result["ocr_load_seconds"]
+        for name in cache_counts:
+            cache_counts[name] += result["ocr_cache"][name]
+        for record in result["pages"]:
+            fresh[record["page"]] = record
+
+    records = []
+    reused_from = set()
+    for page_idx, fp in enumerate(fingerprints):
+        if page_idx in fresh:
+            records.append(fresh[page_idx])
+        else:
+            old_idx, record = previous[fp]
+            reused_from.add(old_idx)
+            records.append(_renumber_page(json.loads(json.dumps(record)), page_idx))
+
+    pdf_data = merge_page_records(records, lang, ocr_load_seconds, cache_counts)
+    pdf_data["page_diff"] = {
+        "page_count": len(fingerprints),
+        "previous_page_count": len(previous_pages),
+        "reprocessed": changed,
+        "reused": [i for i in range(len(fingerprints)) if i not in fresh],
+        "removed": [i for i, entry in enumerate(previous_pages)
+                    if i not in reused_from and entry["fingerprint"] not in fingerprints]
+    }
+
+    state = {
+        "pdf": pdf_path,
+        "lang": lang,
+        "backend": backend,
+        "ocr": ocr,
+        "ocr_planner": planner_config,
+        "pages": [{
+            "fingerprint": fp,
+            "record": {**record, "images": [{k: v for k, v in img.items() if k != "image_bytes"}
+                                            for img in record["images"]]}
+        } for fp, record in zip(fingerprints, records)]
+    }
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+    return pdf_data
+
+def _website_error(error: Exception) -> Dict[str, Any]:
+    return {"website_text": "", "images": [], "graphs": [], "error": str(error)}
+
+# Download and extract web content (text, images, graphs, captions).
+# With a fetcher the request goes through its pooled session, host limit and
+# retries, bounded by the batch deadline; a fetcher with a WebCache serves
+# fresh entries from disk and revalidates stale ones with a conditional GET.
+def extract_website_content(url: str, fetcher: "WebFetcher" = None, deadline: float = None) -> Dict[str, Any]:
+    import requests
+    from web_cache import WebCache
+    cache = getattr(fetcher, "cache", None)
+    with tracing.span("web.extract_website_content", url=url) as web_span:
+        try:
+            entry = cache.get(url) if cache is not None else None
+            if entry is not None and (cache.offline or cache.is_fresh(entry)):
+                cache.count("hits")
+                tracing.count("web.cache_hits")
+                web_span.set(cache="hit")
+                return entry["content"]
+            if cache is not None and cache.offline:
+                cache.count("misses")
+                return _website_error(f"offline: no cached response for {url}")
+            headers = WebCache.revalidation_headers(entry)
+            if fetcher is None:
+                resp = requests.get(url, timeout=10)
+            else:
+                resp = fetcher.fetch(url, deadline, headers=headers)
+            tracing.count("web.requests")
+            tracing.count("web.bytes", len(resp.content))
+            web_span.set(status=resp.status_code, bytes=len(resp.content))
+            if entry is not None and resp.status_code == 304:
+                cache.count("revalidated")
+                tracing.count("web.cache_revalidated")
+                web_span.set(cache="revalidated")
+                cache.touch(url, entry)
+                return entry["content"]
+            content = parse_website_html(url, resp.text)
+            if cache is not None:
+                cache.count("misses")
+                if resp.ok:
+                    cache.put(url, content, resp.headers)
+            return content
+        except Exception as e:
+            tracing.count("web.errors")
+            web_span.set(error=type(e).__name__)
+            return _website_error(e)
+
+# Extract text, images (with captions) and SVG graphs from an HTML page
+@tracing.traced("web.parse_website_html")
+def parse_website_html(url: str, html: str) -> Dict[str, Any]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    # Extract main text
+    paragraphs = soup.find_all("p")
+    website_text = clean_text(" ".join([p.get_text() for p in paragraphs]))
+    # Extract images and attempt to get captions
+    images = []
+    for img in soup.find_all("img"):
+        img_url = img.get("src")
+        if not img_url:
+            continue
+        # Handle relative URLs
+        img_url = urljoin(url, img_url)
+        alt = img.get("alt", "")
+        caption = ""
+        # Try to find figcaption or nearby text
+        parent = img.find_parent("figure")
+        if parent:
+            figcaption = parent.find("figcaption")
+            if figcaption:
+                caption = figcaption.get_text().strip()
+        if not caption and alt:
+            caption = alt
+        images.append({"img_url": img_url, "caption": caption})
+    # Try to extract SVGs (graphs)
+    graphs = []
+    for svg in soup.find_all("svg"):
+        desc = svg.get("aria-label") or svg.get("title") or svg.get_text()
+        graphs.append({"svg": str(svg), "desc": clean_text(desc)})
+    return {
+        "website_text": website_text,
+        "images": images,
+        "graphs": graphs
+    }
+
+# Main orchestrator; pdf_options are passed through to extract_pdf_content,
+# or with state_path to extract_pdf_content_incremental (same options).
+# Only image metadata ends up in the result, so image bytes are never kept.
+# Linked pages are fetched concurrently (http/https only, deduplicated).
+# With state_path, only pages changed since the last run are re-extracted.
+@tracing.traced("ingest.extract_all_content_from_pdf")
+def extract_all_content_from_pdf(pdf_path: str, fetcher: "WebFetcher" = None, state_path: str = None,
+                                 **pdf_options) -> Dict[str, Any]:
+    from web_fetcher import WebFetcher
+    pdf_options["keep_image_bytes"] = False
+    if state_path:
+        pdf_data = extract_pdf_content_incremental(pdf_path, state_path, **pdf_options)
+    else:
+        pdf_data = extract_pdf_content(pdf_path, **pdf_options)
     links = pdf_data["links"]
+    fetcher = fetcher or WebFetcher()
     web_data = []
-    for link in links:
-        web_content = extract_website_content(link)
+    for link, web_content in fetcher.fetch_all(links, extract_website_content, lambda url, e: _website_error(e)):
         web_data.append({
             "url": link,
             "content": web_content
@@ -128,24 +541,50 @@ def extract_all_content_from_pdf(pdf_path: str) -> Dict[str, Any]:
     result = {
         "pdf_text": pdf_data["text"],
         "pdf_graphs": pdf_data["graphs"],
-        "pdf_images": [{"page": img["page"], "img_idx": img["img_idx"], "ext": img["ext"]} for img in pdf_data["images"]],
-        "web_data": web_data
+        "pdf_images": [{"page": img["page"], "img_idx": img["img_idx"], "ext": img["ext"],
+                        "ocr_decision": img.get("ocr_decision")} for img in pdf_data["images"]],
+        "web_data": web_data,
+        "ocr_stats": pdf_data["ocr_stats"]
     }
+    if fetcher.cache is not None:
+        result["web_cache"] = fetcher.cache.stats()
+    if "page_diff" in pdf_data:
+        result["page_diff"] = pdf_data["page_diff"]
     return result
 
+# Extract paragraphs and tables from a .docx (e.g. the founders checklist)
+@tracing.traced("ingest.extract_docx_content")
+def extract_docx_content(docx_path: str) -> Dict[str, Any]:
+    from docx import Document
+    doc = Document(docx_path)
+    paragraphs = [para.text for para in doc.paragraphs if para.text.strip() != ""]
+    tables = [[[cell.text.strip() for cell in row.cells] for row in table.rows] for table in doc.tables]
+    return {
+        "docx_text": clean_text("\n".join(paragraphs)),
+        "docx_tables": tables
+    }
+
 def save_all_data(all_data, filename='all_extracted_data.json'):
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
+    with tracing.span("json.save_all_data", path=filename) as save_span:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(all_data, f, ensure_ascii=False, indent=2)
+            save_span.set(bytes=f.tell())
+    tracing.count("json.bytes_written", os.path.getsize(filename))
 
 
 
 # Example usage
 if __name__ == "__main__":
+    from web_fetcher import WebFetcher
+    from web_cache import WebCache
     pdf_path = "data/input/Naario/NaarioDeck2025.pdf"
-    all_data = extract_all_content_from_pdf(pdf_path)
-    # Just pretty print keys
-    from pprint import pprint
-    pprint(all_data)
-    
-    save_all_data(all_data)
+    output_path = 'all_extracted_data.json'
+    # PIPELINE_TRACE=trace.json writes a span/counter trace of this run
+    with tracing.trace_to(os.environ.get(tracing.TRACE_ENV_VAR)):
+        all_data = extract_all_content_from_pdf(pdf_path, fetcher=WebFetcher(cache=WebCache()),
+                                                state_path=page_state_path(output_path), ocr_cache=OCRCache())
+        # Just pretty print keys
+        from pprint import pprint
+        pprint(all_data)
 
+        save_all_data(all_data, output_path)
@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+TRACE_ENV_VAR = "PIPELINE_TRACE"
+
+
+# Context manager handed out while tracing is off: no clock reads, no records
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.start = 0.0
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Span":
+        stack = self.tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.seconds = time.perf_counter() - self.start
+        # remove() rather than pop(): a generator's span can close after spans
+        # its consumer opened in between
+        stack = self.tracer._stack()
+        if self in stack:
+            stack.remove(self)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._record(self)
+        return False
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+# Collects finished spans and named counters for one run. Spans nest per
+# thread; work done in worker processes is not captured.
+class Tracer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: Span) -> None:
+        record = {
+            "name": span.name,
+            "parent": span.parent,
+            "start": round(span.start - self.origin, 6),
+            "seconds": round(span.seconds, 6),
+            "thread": threading.current_thread().name,
+            "attrs": span.attrs,
+        }
+        with self._lock:
+            self.spans.append(record)
+
+    def span(self, name: str, **attrs) -> Span:
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # Calls, total and max seconds per span name, slowest stage first
+    def summary(self) -> List[Dict[str, Any]]:
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = totals.setdefault(span["name"], {"name": span["name"], "calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += span["seconds"]
+            entry["max_seconds"] = max(entry["max_seconds"], span["seconds"])
+        rows = sorted(totals.values(), key=lambda entry: -entry["seconds"])
+        for entry in rows:
+            entry["seconds"] = round(entry["seconds"], 4)
+            entry["max_seconds"] = round(entry["max_seconds"], 4)
+        return rows
+
+    # Spans as Chrome trace events (viewable in chrome://tracing or Perfetto)
+    # next to the counters and the per-stage summary
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        threads: Dict[str, int] = {}
+        events = [{
+            "name": span["name"],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6),
+            "dur": round(span["seconds"] * 1e6),
+            "pid": os.getpid(),
+            "tid": threads.setdefault(span["thread"], len(threads)),
+            "args": span["attrs"],
+        } for span in spans]
+        return {"traceEvents": events, "counters": counters, "summary": self.summary(), "spans": spans}
+
+    def export(self, path: str) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+
+# Active tracer of the current context (a CLI run, one dashboard session);
+# None means tracing is disabled and every helper below returns immediately.
+# Threads don't inherit it: hand work to a pool through submit() below.
+_current: contextvars.ContextVar[Optional[Tracer]] = contextvars.ContextVar("tracer", default=None)
+
+
+def enable() -> Tracer:
+    tracer = Tracer()
+    _current.set(tracer)
+    return tracer
+
+
+def disable() -> Optional[Tracer]:
+    tracer = _current.get()
+    _current.set(None)
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _current.get()
+
+
+# Make tracer (None for none) the active one for the enclosed block only
+@contextmanager
+def activate(tracer: Optional[Tracer]):
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+# executor.submit(fn, ...) run in a copy of the caller's context, so spans
+# recorded by fn land in the caller's tracer
+def submit(executor: Executor, fn: Callable, *args, **kwargs) -> Future:
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def span(name: str, **attrs):
+    tracer = _current.get()
+    if tracer is None:
+        return _NOOP_SPAN
+    return tracer.span(name, **attrs)
+
+
+def count(name: str, value: float = 1) -> None:
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+# Decorator form of span() for whole functions
+def traced(name: str) -> Callable:
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _current.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Trace the enclosed block and write it to path (e.g. from PIPELINE_TRACE)
+@contextmanager
+def trace_to(path: Optional[str]):
+    if not path:
+        yield None
+        return
+    tracer = Tracer()
+    try:
+        with activate(tracer):
+            yield tracer
+    finally:
+        tracer.export(path)
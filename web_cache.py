@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from web_fetcher import normalize_url
+
+DEFAULT_WEB_CACHE_DIR = os.path.join(".cache", "web")
+DEFAULT_WEB_CACHE_TTL = 24 * 60 * 60
+
+
+# On-disk cache of parsed web pages (the extract_website_content result),
+# keyed by normalized URL. Entries younger than ttl seconds are served as-is;
+# older ones are revalidated with If-None-Match / If-Modified-Since so an
+# unchanged page costs a 304 and no re-parse. In offline mode only the cache
+# is consulted, whatever the entry's age.
+class WebCache:
+    def __init__(self, directory: str = DEFAULT_WEB_CACHE_DIR, ttl: float = DEFAULT_WEB_CACHE_TTL,
+                 offline: bool = False):
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        self.counts = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".json")
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, content: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content": content,
+        }
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def touch(self, url: str, entry: Dict[str, Any]) -> None:
+        # A 304 confirmed the stored copy; restart its TTL
+        self.put(url, entry["content"], {"ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified")})
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counts)
@@ -0,0 +1,132 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+
+FETCHABLE_SCHEMES = ("http", "https")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+# Lowercase scheme/host, drop default ports and fragments so the same page
+# linked twice from a deck is fetched once.
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+# Keep only http(s) links (no mailto:, tel:, ...), deduplicated by normalized
+# form, in first-seen order. Malformed URLs (bad port, broken IPv6 literal)
+# are dropped and passed to on_invalid(link, error) when given.
+def filter_links(links: List[str],
+                 on_invalid: Optional[Callable[[str, ValueError], None]] = None) -> List[str]:
+    seen = set()
+    kept = []
+    for link in links:
+        try:
+            if urlsplit(link.strip()).scheme.lower() not in FETCHABLE_SCHEMES:
+                continue
+            normalized = normalize_url(link)
+        except ValueError as e:
+            if on_invalid is not None:
+                on_invalid(link, e)
+            continue
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        kept.append(link)
+    return kept
+
+
+def make_session(pool_size: int = 16) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Thread-pooled fetcher sharing one pooled session. At most per_host requests
+# run against the same host at a time, transient failures are retried with
+# jittered exponential backoff, and fetch_all gives up on whatever is still
+# outstanding once total_budget seconds have passed. An optional response
+# cache (web_cache.WebCache) is consulted by extract_website_content.
+class WebFetcher:
+    def __init__(self, max_workers: int = 8, per_host: int = 2, timeout: float = 10,
+                 total_budget: float = 60, retries: int = 2, backoff: float = 0.5,
+                 session: requests.Session = None, cache=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.total_budget = total_budget
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.session = session or make_session(max(max_workers, per_host))
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host)
+            return self._host_slots[host]
+
+    def fetch(self, url: str, deadline: Optional[float] = None, headers: Dict[str, str] = None) -> requests.Response:
+        deadline = deadline or time.monotonic() + self.total_budget
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"time budget exceeded fetching {url}")
+            try:
+                with self._host_slot(url):
+                    resp = self.session.get(url, timeout=min(self.timeout, remaining), headers=headers)
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return resp
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if time.monotonic() + delay >= deadline:
+                raise TimeoutError(f"time budget exceeded fetching {url}")
+            time.sleep(delay)
+            attempt += 1
+
+    def fetch_all(self, urls: List[str], handle: Callable[[str, "WebFetcher", float], Dict[str, Any]],
+                  on_error: Callable[[str, Exception], Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        # handle(url, fetcher, deadline) does the fetch + parse for one URL;
+        # on_error builds the result for URLs that failed, ran out of time or
+        # could not be parsed at all.
+        invalid = []
+        urls = filter_links(urls, lambda url, e: invalid.append((url, e)))
+        deadline = time.monotonic() + self.total_budget
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {url: tracing.submit(executor, handle, url, self, deadline) for url in urls}
+            wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        results = [(url, on_error(url, error)) for url, error in invalid]
+        for url, future in futures.items():
+            if future.cancelled() or not future.done():
+                results.append((url, on_error(url, TimeoutError(f"time budget exceeded fetching {url}"))))
+                continue
+            error = future.exception()
+            results.append((url, on_error(url, error) if error else future.result()))
+        return results